@@ -0,0 +1,109 @@
+"""Compare full response CRC validation with incremental validation.
+
+Usage: python benchmarks/crc_benchmark.py [fragment size]
+
+Needs bluetti_mqtt installed. Measures a 62 register read (129 bytes),
+split into BLE notifications of the given size (default 20 bytes, the
+payload of the default ATT MTU).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import os
+import struct
+import sys
+import timeit
+
+from bluetti_mqtt.core.commands import ReadHoldingRegisters
+from bluetti_mqtt.core.utils import modbus_crc
+
+# Load module directly to avoid importing Home Assistant
+_spec = importlib.util.spec_from_file_location(
+    "bluetti_bt_modbus",
+    Path(__file__).parents[1] / "custom_components" / "bluetti_bt" / "modbus.py",
+)
+modbus = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = modbus
+_spec.loader.exec_module(modbus)
+
+NUMBER = 20000
+# Best of several runs, to reduce noise
+REPEAT = 5
+
+
+def build_response(command: ReadHoldingRegisters) -> bytes:
+    """Build a valid response for a read command."""
+    body = os.urandom(2 * command.quantity)
+    response = bytearray(b"\x01\x03" + bytes([len(body)]) + body)
+    response += struct.pack("<H", modbus_crc(bytes(response)))
+    return bytes(response)
+
+
+def per_response(command, fragments) -> bool:
+    """Previous implementation: extend a bytearray, validate at the end."""
+    response = bytearray()
+    for fragment in fragments:
+        response.extend(fragment)
+        if len(response) == command.response_size():
+            return command.is_valid_response(response)
+        command.is_exception_response(response)
+    return False
+
+
+def incremental(command, fragments) -> bool:
+    """ResponseBuffer with running CRC."""
+    buffer = modbus.ResponseBuffer(command)
+    for fragment in fragments:
+        if buffer.add(fragment):
+            return buffer.is_valid()
+        buffer.is_exception()
+    return False
+
+
+def main() -> None:
+    """Run benchmark."""
+    fragment_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    command = ReadHoldingRegisters(100, 62)
+    response = build_response(command)
+    fragments = [
+        response[i : i + fragment_size] for i in range(0, len(response), fragment_size)
+    ]
+    assert per_response(command, fragments)
+    assert incremental(command, fragments)
+
+    print(f"{len(response)} byte response in {len(fragments)} fragments")
+    for name, func in (("per response", per_response), ("incremental", incremental)):
+        total = min(
+            timeit.repeat(lambda: func(command, fragments), number=NUMBER, repeat=REPEAT)
+        )
+        print(f"{name:>14}: {total / NUMBER * 1e6:.2f} us per response")
+
+    # Work left when the last fragment arrives
+    last = fragments[-1]
+    head = bytearray(response[: -len(last)])
+
+    def per_response_last():
+        full = head + last
+        return command.is_valid_response(full)
+
+    buffer = modbus.ResponseBuffer(command)
+    for fragment in fragments[:-1]:
+        buffer.add(fragment)
+
+    def incremental_last():
+        buffer.size = len(head)
+        buffer.add(last)
+        return buffer.is_valid()
+
+    for name, func in (
+        ("per response", per_response_last),
+        ("incremental", incremental_last),
+    ):
+        total = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+        print(f"{name:>14}: {total / NUMBER * 1e6:.2f} us on last fragment")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Simulated Bluetti BLE peripheral.
+
+FakeBleakClient can be used in place of bleak's BleakClient. It answers
+MODBUS requests from a register image built from the device struct, so
+the complete polling path of the integration can run without hardware.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import random
+import struct
+
+from bleak import BleakError
+from bluetti_mqtt.core.devices.bluetti_device import BluettiDevice
+from bluetti_mqtt.core.devices.struct import (
+    BoolField,
+    DecimalArrayField,
+    DecimalField,
+    EnumField,
+    SerialNumberField,
+    StringField,
+    SwapStringField,
+    UintField,
+    VersionField,
+)
+from bluetti_mqtt.core.utils import modbus_crc
+
+# Bluetooth names used to build the device models
+MODEL_NAMES = {
+    "AC300": "AC3002235000000000",
+    "EB3A": "EB3A2235000000000",
+    "EP600": "EP6002235000000000",
+}
+
+# Register values which differ from the generated image, by model
+REGISTER_OVERRIDES: dict[str, dict[int, int]] = {
+    "AC300": {91: 4},  # pack_num_max
+    "EB3A": {},
+    "EP600": {},
+}
+
+
+def build_register_image(device: BluettiDevice) -> dict[int, int]:
+    """Build plausible register values for all fields of a device."""
+    image: dict[int, int] = {}
+    for device_field in device.struct.fields:
+        address = device_field.address
+        if isinstance(device_field, BoolField):
+            image[address] = 1
+        elif isinstance(device_field, EnumField):
+            image[address] = next(iter(device_field.enum)).value
+        elif isinstance(device_field, (StringField, SwapStringField)):
+            text = device.type.encode().ljust(2 * device_field.size, b"\0")
+            if isinstance(device_field, SwapStringField):
+                text = bytes(b for pair in zip(text[1::2], text[::2]) for b in pair)
+            for i in range(device_field.size):
+                image[address + i] = struct.unpack_from("!H", text, 2 * i)[0]
+        elif isinstance(device_field, SerialNumberField):
+            for i in range(4):
+                image[address + i] = 0x1234
+        elif isinstance(device_field, VersionField):
+            image[address] = 4012
+            image[address + 1] = 0
+        elif isinstance(device_field, DecimalArrayField):
+            for i in range(device_field.size):
+                image[address + i] = 330 + i
+        elif isinstance(device_field, (UintField, DecimalField)):
+            value = 100
+            if device_field.range is not None:
+                value = int(device_field.range[0])
+            image[address] = value
+    image.update(REGISTER_OVERRIDES.get(device.type, {}))
+    return image
+
+
+@dataclass
+class FakeDeviceConfig:
+    """Behaviour of the simulated device."""
+
+    mtu: int = 23  # Notification payload is mtu - 3
+    connect_time: float = 0.0  # Seconds
+    response_delay: float = 0.05  # Seconds from request to first fragment
+    fragment_interval: float = 0.0075  # Seconds between fragments
+    drop_rate: float = 0.0  # Probability of a dropped notification
+    corrupt_rate: float = 0.0  # Probability of a corrupted notification
+    disconnect_rate: float = 0.0  # Probability of losing the connection on a write
+    late_rate: float = 0.0  # Probability of a response delayed by late_delay
+    late_delay: float = 1.0  # Extra seconds before a late response
+    apply_delay: float = 0.0  # Seconds until a written setting shows in status registers
+    seed: int | None = None
+
+
+@dataclass
+class FakeDeviceStats:
+    """Counters of the simulated radio link."""
+
+    connects: int = 0
+    requests: int = 0
+    bytes_written: int = 0
+    bytes_notified: int = 0
+    dropped: int = 0
+    corrupted: int = 0
+    disconnects: int = 0
+    late: int = 0
+
+    @property
+    def bytes_on_air(self) -> int:
+        """Payload bytes in both directions."""
+        return self.bytes_written + self.bytes_notified
+
+
+class FakeBleakClient:
+    """In-process replacement for BleakClient talking to a fake device."""
+
+    def __init__(
+        self,
+        device: BluettiDevice,
+        config: FakeDeviceConfig | None = None,
+        registers: dict[int, int] | None = None,
+    ) -> None:
+        """Init fake client for the device model."""
+        self.config = config or FakeDeviceConfig()
+        self.registers = registers if registers is not None else build_register_image(device)
+        self.stats = FakeDeviceStats()
+        self.received: list[bytes] = []  # Requests in the order they arrived
+        # Called with every request, returns the response to send instead of
+        # the regular one, empty to send nothing, or None
+        self.request_hook: Callable[[bytes], bytes | None] | None = None
+        # Read-only fields follow writable fields with the same name, like
+        # the selected battery pack or the state of an output
+        writable = [
+            f for f in device.struct.fields
+            if any(f.address in r for r in device.writable_ranges)
+        ]
+        self._linked = {
+            setter.address: [
+                f.address for f in device.struct.fields
+                if f.name == setter.name and f not in writable
+            ]
+            for setter in writable
+        }
+        self._connected = False
+        self._handler: Callable[[int, bytearray], None] | None = None
+        self._busy_until = 0.0
+        self._random = random.Random(self.config.seed)
+
+    @property
+    def is_connected(self) -> bool:
+        """Return if connected."""
+        return self._connected
+
+    async def connect(self, **kwargs) -> bool:
+        """Connect to the device."""
+        await asyncio.sleep(self.config.connect_time)
+        self._connected = True
+        self.stats.connects += 1
+        return True
+
+    async def disconnect(self) -> bool:
+        """Disconnect from the device."""
+        self._connected = False
+        self._handler = None
+        return True
+
+    async def start_notify(self, _uuid: str, handler: Callable[[int, bytearray], None], **kwargs) -> None:
+        """Register notification handler."""
+        self._handler = handler
+
+    async def stop_notify(self, _uuid: str) -> None:
+        """Remove notification handler."""
+        self._handler = None
+
+    async def write_gatt_char(self, _uuid: str, data: bytes, response: bool = False) -> None:
+        """Receive a MODBUS request."""
+        if not self._connected:
+            raise BleakError("Not connected")
+        if self._random.random() < self.config.disconnect_rate:
+            self.lose_connection()
+        data = bytes(data)
+        response = self.request_hook(data) if self.request_hook is not None else None
+        if not self._connected:
+            raise BleakError("Disconnected")
+        self.stats.requests += 1
+        self.received.append(data)
+        self.stats.bytes_written += len(data)
+        self._respond(response if response is not None else self._handle_request(data))
+
+    def lose_connection(self) -> None:
+        """Drop the connection like a device going out of range."""
+        self.stats.disconnects += 1
+        self._connected = False
+        self._handler = None
+
+    def _handle_request(self, data: bytes) -> bytes:
+        """Build the response to a request."""
+        function_code = data[1]
+        if function_code == 3:
+            start, quantity = struct.unpack_from("!HH", data, 2)
+            body = b"".join(
+                struct.pack("!H", self.registers.get(address, 0) & 0xFFFF)
+                for address in range(start, start + quantity)
+            )
+            response = bytes([1, 3, len(body)]) + body
+        elif function_code == 6:
+            address, value = struct.unpack_from("!HH", data, 2)
+            self._write(address, [value])
+            response = data[:6]
+        elif function_code == 16:
+            start, quantity = struct.unpack_from("!HH", data, 2)
+            values = struct.unpack_from(f"!{quantity}H", data, 7)
+            self._write(start, values)
+            response = data[:6]
+        else:
+            response = bytes([1, function_code | 0x80, 1])
+        return response + struct.pack("<H", modbus_crc(response))
+
+    def _write(self, start: int, values) -> None:
+        """Write registers."""
+        for offset, value in enumerate(values):
+            self.registers[start + offset] = value
+            for address in self._linked.get(start + offset, []):
+                if self.config.apply_delay > 0:
+                    asyncio.get_running_loop().call_later(
+                        self.config.apply_delay, self.registers.__setitem__, address, value
+                    )
+                else:
+                    self.registers[address] = value
+
+    def _respond(self, response: bytes) -> None:
+        """Send a response in MTU sized notifications.
+
+        The device answers one request after the other.
+        """
+        loop = asyncio.get_running_loop()
+        payload = self.config.mtu - 3
+        when = max(loop.time() + self.config.response_delay, self._busy_until)
+        if self._random.random() < self.config.late_rate:
+            when += self.config.late_delay
+            self.stats.late += 1
+        for offset in range(0, len(response), payload):
+            fragment = bytearray(response[offset : offset + payload])
+            when += self.config.fragment_interval
+            if self._random.random() < self.config.drop_rate:
+                self.stats.dropped += 1
+                continue
+            if self._random.random() < self.config.corrupt_rate:
+                fragment[self._random.randrange(len(fragment))] ^= 0xFF
+                self.stats.corrupted += 1
+            self.stats.bytes_notified += len(fragment)
+            loop.call_at(when, self._notify, fragment)
+        self._busy_until = when
+
+    def _notify(self, fragment: bytearray) -> None:
+        """Call the notification handler."""
+        if self._handler is not None:
+            self._handler(0, fragment)
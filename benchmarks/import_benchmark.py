@@ -0,0 +1,103 @@
+"""Import time benchmark of the integration.
+
+Usage: python benchmarks/import_benchmark.py [--runs N]
+
+Needs Home Assistant and bluetti_mqtt installed. Every stage runs in a
+fresh interpreter which first imports the Home Assistant modules the
+integration depends on, as those are already loaded in a running
+instance. Reports the median time to import the modules of the stage
+and which of the heavy dependencies got loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).parents[1]
+PACKAGE = "custom_components.bluetti_bt"
+
+# Loaded by Home Assistant before the integration, bleak included
+BASELINE = [
+    "homeassistant.components.bluetooth",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.sensor",
+    "homeassistant.components.switch",
+    "homeassistant.helpers.update_coordinator",
+]
+
+# What Home Assistant imports, in order
+STAGES = {
+    # The coordinator, and with it bluetti_mqtt, is loaded with the integration
+    "integration": [PACKAGE],
+    "config_flow": [f"{PACKAGE}.config_flow"],
+    "platforms": [
+        f"{PACKAGE}.binary_sensor",
+        f"{PACKAGE}.sensor",
+        f"{PACKAGE}.switch",
+        f"{PACKAGE}.diagnostics",
+    ],
+}
+
+HEAVY_MODULES = ["bluetti_mqtt", "bluetti_mqtt.mqtt_client", "asyncio_mqtt", "paho"]
+
+CHILD = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+for name in {baseline!r}:
+    importlib.import_module(name)
+for name in {previous!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "modules": len(set(sys.modules) - before),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(previous: list[str], modules: list[str]) -> dict:
+    """Import modules in a fresh interpreter."""
+    code = CHILD.format(
+        root=str(ROOT),
+        baseline=BASELINE,
+        previous=previous,
+        modules=modules,
+        heavy=HEAVY_MODULES,
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="runs per stage")
+    args = parser.parse_args()
+
+    previous: list[str] = []
+    print(f"{'stage':<12} {'median ms':>10} {'modules':>8}  heavy modules loaded")
+    for stage, modules in STAGES.items():
+        runs = [measure(previous, modules) for _ in range(args.runs)]
+        median = statistics.median(run["ms"] for run in runs)
+        print(
+            f"{stage:<12} {median:>10.1f} {runs[-1]['modules']:>8}  "
+            f"{', '.join(runs[-1]['heavy']) or '-'}"
+        )
+        previous += modules
+
+
+if __name__ == "__main__":
+    main()
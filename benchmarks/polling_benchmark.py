@@ -0,0 +1,241 @@
+"""End-to-end polling benchmark with a simulated device.
+
+Usage: python benchmarks/polling_benchmark.py [options]
+
+Needs Home Assistant and bluetti_mqtt installed. Runs the full
+PollingCoordinator._async_update_data path against FakeBleakClient (one
+per device, all on the same adapter) and reports per cycle:
+
+- wall time of the cycle
+- round trips (commands written to the device)
+- time until the field given with --watch is passed to the entities of
+  the first device
+- bytes on air (requests and notification payloads)
+- CPU time of the process, which is the event loop and the simulated
+  device, as nothing else runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt import connection as connection_module
+from custom_components.bluetti_bt import coordinator as coordinator_module
+from custom_components.bluetti_bt.connection import ConnectionMode
+from custom_components.bluetti_bt.const import DOMAIN
+from custom_components.bluetti_bt.coordinator import (
+    PollingCoordinator,
+    build_dummy_device,
+)
+
+from fake_device import MODEL_NAMES, FakeBleakClient, FakeDeviceConfig
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", choices=sorted(MODEL_NAMES), default="AC300")
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--devices", type=int, default=1, help="devices on one adapter")
+    parser.add_argument(
+        "--interval", type=float, default=0, help="seconds between cycles"
+    )
+    parser.add_argument("--mtu", type=int, default=23)
+    parser.add_argument("--connect-time", type=float, default=0.0, help="seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="response delay in seconds")
+    parser.add_argument("--fragment-interval", type=float, default=0.0075, help="seconds")
+    parser.add_argument("--drop", type=float, default=0.0, help="notification drop rate")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="notification corruption rate")
+    parser.add_argument(
+        "--disconnect", type=float, default=0.0, help="connection loss rate per request"
+    )
+    parser.add_argument("--late", type=float, default=0.0, help="late response rate")
+    parser.add_argument(
+        "--late-delay", type=float, default=1.0, help="extra delay of late responses"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--connection-mode",
+        choices=[mode.value for mode in ConnectionMode],
+        default=ConnectionMode.NEVER.value,
+    )
+    parser.add_argument(
+        "--all-tiers", action="store_true", help="poll all tiers in every cycle"
+    )
+    parser.add_argument("--timeout", type=int, default=45, help="polling timeout")
+    parser.add_argument(
+        "--watch", default="ac_output_power", help="field to measure the publication of"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run polling cycles and print the results."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.data[DOMAIN] = {}
+
+    addresses = [f"00:11:22:33:44:{index:02X}" for index in range(args.devices)]
+    devices = [
+        build_dummy_device(address, MODEL_NAMES[args.model]) for address in addresses
+    ]
+    clients = [
+        FakeBleakClient(
+            device,
+            FakeDeviceConfig(
+                mtu=args.mtu,
+                connect_time=args.connect_time,
+                response_delay=args.latency,
+                fragment_interval=args.fragment_interval,
+                drop_rate=args.drop,
+                corrupt_rate=args.corrupt,
+                disconnect_rate=args.disconnect,
+                late_rate=args.late,
+                late_delay=args.late_delay,
+                seed=args.seed + index,
+            ),
+        )
+        for index, device in enumerate(devices)
+    ]
+
+    # All devices share one adapter
+    with patch.object(
+        coordinator_module.bluetooth,
+        "async_ble_device_from_address",
+        side_effect=lambda _hass, address: SimpleNamespace(address=address),
+    ), patch.object(
+        coordinator_module.bluetooth, "async_address_present", return_value=True
+    ), patch.object(coordinator_module, "BleakClient", side_effect=clients), patch.object(
+        connection_module.bluetooth, "async_last_service_info", return_value=None
+    ):
+        coordinators = []
+        for address, device in zip(addresses, devices):
+            coordinator = PollingCoordinator(
+                hass,
+                address,
+                device,
+                polling_interval=args.interval,
+                connection_mode=ConnectionMode(args.connection_mode),
+                polling_timeout=args.timeout,
+                max_retries=3,
+                pack_polling_interval=300,
+            )
+            coordinator.config_entry = SimpleNamespace(
+                entry_id=address, pref_disable_polling=True
+            )
+            hass.data[DOMAIN][address] = {}
+            coordinators.append(coordinator)
+
+        await run_cycles(args, coordinators, clients)
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+async def run_cycles(
+    args: argparse.Namespace,
+    coordinators: list[PollingCoordinator],
+    clients: list[FakeBleakClient],
+) -> None:
+    """Poll all devices with the polling interval and print the results."""
+    device = coordinators[0].bluetti_device
+
+    print(
+        f"{len(coordinators)} x {args.model}: {len(device.struct.fields)} fields, "
+        f"mtu {args.mtu}, latency {args.latency * 1000:.0f} ms, "
+        f"drop {args.drop}, corrupt {args.corrupt}, disconnect {args.disconnect}, "
+        f"late {args.late}"
+    )
+    print(
+        f"{'cycle':>5} {'wall ms':>9} {'cpu ms':>8} {'trips':>6} {'bytes':>7} "
+        f"{'fields':>7} {'field ms':>9}"
+    )
+
+    # Time the watched field is passed to the entities in a cycle
+    published: list[float] = []
+    publish = coordinators[0]._async_publish_values
+
+    def watch_publish(keys) -> None:
+        keys = list(keys)
+        if args.watch in keys and not published:
+            published.append(time.perf_counter())
+        publish(keys)
+
+    coordinators[0]._async_publish_values = watch_publish
+
+    results = []
+    for cycle in range(1, args.cycles + 1):
+        if cycle > 1:
+            await asyncio.sleep(args.interval)
+        if args.all_tiers:
+            for coordinator in coordinators:
+                coordinator._reset_tiers()
+        requests = sum(client.stats.requests for client in clients)
+        bytes_on_air = sum(client.stats.bytes_on_air for client in clients)
+        published.clear()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+
+        all_data = await asyncio.gather(
+            *(coordinator._async_update_data() for coordinator in coordinators)
+        )
+
+        field_ms = (published[0] - wall) * 1000 if published else None
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        trips = sum(client.stats.requests for client in clients) - requests
+        on_air = sum(client.stats.bytes_on_air for client in clients) - bytes_on_air
+        fields = 0
+        for coordinator, data in zip(coordinators, all_data):
+            coordinator.data = data
+            fields += len(data) if data else 0
+        results.append((wall, cpu, trips, on_air))
+        print(
+            f"{cycle:>5} {wall * 1000:>9.1f} {cpu * 1000:>8.2f} {trips:>6} {on_air:>7} "
+            f"{fields:>7} {'-' if field_ms is None else round(field_ms, 1):>9}"
+        )
+
+    if len(results) > 1:
+        walls, cpus, trips, on_air = zip(*results)
+        print(
+            f"{'mean':>5} {statistics.mean(walls) * 1000:>9.1f} "
+            f"{statistics.mean(cpus) * 1000:>8.2f} {statistics.mean(trips):>6.1f} "
+            f"{statistics.mean(on_air):>7.0f}"
+        )
+    print(
+        f"connects {sum(client.stats.connects for client in clients)}, "
+        f"dropped {sum(client.stats.dropped for client in clients)}, "
+        f"corrupted {sum(client.stats.corrupted for client in clients)}, "
+        f"disconnects {sum(client.stats.disconnects for client in clients)}, "
+        f"late {sum(client.stats.late for client in clients)}"
+    )
+    summary = coordinators[0].metric_summary()
+    print(
+        "command latency p50/p95/p99 "
+        f"{summary['latency_p50']}/{summary['latency_p95']}/{summary['latency_p99']} ms, "
+        f"errors {summary['errors']}, dropped commands {summary['dropped_commands']}"
+    )
+    print(f"adapter queue wait p50/p95 {summary['adapter_wait_p50']}/{summary['adapter_wait_p95']} ms")
+
+
+def main() -> None:
+    """Run benchmark."""
+    args = parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,16 +14,19 @@ from homeassistant.exceptions import ConfigEntryNotReady
 
 from .const import (
     CONF_MAX_RETRIES,
-    CONF_PERSISTENT_CONN,
+    CONF_PACK_POLLING_INTERVAL,
     CONF_POLLING_INTERVAL,
     CONF_POLLING_TIMEOUT,
     CONF_USE_CONTROLS,
     DATA_COORDINATOR,
+    DATA_DEVICE,
     DATA_POLLING_RUNNING,
     DOMAIN,
     MANUFACTURER,
 )
-from .coordinator import PollingCoordinator
+from .connection import get_connection_mode
+from .coordinator import PollingCoordinator, build_dummy_device
+from .services import async_setup_services
 
 PLATFORMS: [Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 _LOGGER = logging.getLogger(__name__)
@@ -36,24 +39,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     device_name = entry.data.get(CONF_NAME)
     use_controls = entry.data.get(CONF_USE_CONTROLS)
     polling_interval = entry.data.get(CONF_POLLING_INTERVAL, 20)
-    persistent_conn = entry.data.get(CONF_PERSISTENT_CONN, False)
+    connection_mode = get_connection_mode(entry.data)
     polling_timeout = entry.data.get(CONF_POLLING_TIMEOUT, 45)
     max_retries = entry.data.get(CONF_MAX_RETRIES, 5)
+    pack_polling_interval = entry.data.get(CONF_PACK_POLLING_INTERVAL, 300)
 
     if address is None:
         return False
 
-    if not bluetooth.async_address_present(hass, address):
-        raise ConfigEntryNotReady("Bluetti device not present")
-
     # Create data structure
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault(entry.entry_id, {})
     hass.data[DOMAIN][entry.entry_id].setdefault(DATA_POLLING_RUNNING, False)
 
+    # Device model shared by coordinator and platforms
+    bluetti_device = build_dummy_device(address, device_name)
+    hass.data[DOMAIN][entry.entry_id][DATA_DEVICE] = bluetti_device
+
     # Create coordinator for polling
-    coordinator = PollingCoordinator(hass, address, device_name, polling_interval, persistent_conn, polling_timeout, max_retries)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = PollingCoordinator(hass, address, bluetti_device, polling_interval, connection_mode, polling_timeout, max_retries, pack_polling_interval)
+    restored = await coordinator.async_restore_snapshot()
+    if not restored and not bluetooth.async_address_present(hass, address):
+        raise ConfigEntryNotReady("Bluetti device not present")
+
+    coordinator.async_track_advertisements()
+    if restored:
+        # Entities show the stored data until the first poll is done
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id].setdefault(DATA_COORDINATOR, coordinator)
 
     platforms: list = PLATFORMS
@@ -64,9 +80,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, platforms)
 
+    async_setup_services(hass)
+
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted entry."""
+    from .snapshot import async_remove_snapshot
+
+    await async_remove_snapshot(hass, entry.entry_id)
+
+
 def device_info(entry: ConfigEntry) -> DeviceInfo:
     """Device info."""
     return DeviceInfo(
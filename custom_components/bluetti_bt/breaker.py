@@ -0,0 +1,71 @@
+"""Circuit breaker for unreachable devices."""
+
+from __future__ import annotations
+
+from enum import Enum
+import random
+
+
+class BreakerState(Enum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"  # Polling normally
+    OPEN = "open"  # Device unreachable, polls fail fast
+    HALF_OPEN = "half_open"  # Trying a single poll
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Get the delay before a retry, exponential with full jitter."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Stops polling a device after repeated failures.
+
+    After `threshold` failed polls in a row the breaker opens and polls
+    fail without connecting. When the reset timeout passed, one poll is
+    tried. If it fails, the breaker opens again with twice the timeout.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float, max_reset_timeout: float) -> None:
+        """Init breaker."""
+        self.threshold = threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_until = 0.0  # Monotonic time
+
+    def allow(self, now: float) -> bool:
+        """Check if a poll may be tried."""
+        if self.state is BreakerState.OPEN:
+            if now < self.opened_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def retry_now(self) -> None:
+        """Allow a single poll before the reset timeout passed."""
+        if self.state is BreakerState.OPEN:
+            self.state = BreakerState.HALF_OPEN
+
+    def record_success(self) -> None:
+        """Poll succeeded."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self, now: float) -> None:
+        """Poll failed."""
+        self.failures += 1
+        if self.state is BreakerState.HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open(now)
+        elif self.state is BreakerState.CLOSED and self.failures >= self.threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        """Stop polling for the reset timeout."""
+        self.state = BreakerState.OPEN
+        self.opened_until = now + self.reset_timeout
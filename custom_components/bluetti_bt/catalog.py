@@ -0,0 +1,119 @@
+"""Entity catalog for Bluetti devices."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import CONF_STATE_CLASS
+from homeassistant.const import (
+    CONF_DEVICE_CLASS,
+    CONF_NAME,
+    CONF_UNIT_OF_MEASUREMENT,
+    EntityCategory,
+    Platform,
+)
+
+from .const import CONF_OPTIONS, CONTROL_FIELDS, DIAGNOSTIC_FIELDS
+from .field_table import DEVICE_FIELDS, FIELDS
+from .fields import FieldConfig, FieldType
+
+if TYPE_CHECKING:
+    from bluetti_mqtt.core.devices.bluetti_device import BluettiDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Catalogs by device type
+_CATALOGS: dict[str, dict[Platform, tuple[EntityDescriptor, ...]]] = {}
+
+
+@dataclass(frozen=True)
+class EntityDescriptor:
+    """Description of an entity for a device field."""
+
+    key: str
+    platform: Platform
+    name: str
+    category: EntityCategory | None = None
+    unit_of_measurement: str | None = None
+    device_class: str | None = None
+    state_class: str | None = None
+    options: tuple[str, ...] | None = None
+
+
+def get_entity_descriptors(
+    device: BluettiDevice, platform: Platform
+) -> tuple[EntityDescriptor, ...]:
+    """Get the entities of a platform for a device."""
+    if device.type not in _CATALOGS:
+        _CATALOGS[device.type] = _build_catalog(device)
+    return _CATALOGS[device.type].get(platform, ())
+
+
+def _build_catalog(device: BluettiDevice) -> dict[Platform, tuple[EntityDescriptor, ...]]:
+    """Build the entity descriptors for a device type."""
+    if device.type not in DEVICE_FIELDS:
+        _LOGGER.warning("No fields known for device type %s", device.type)
+
+    descriptors: list[EntityDescriptor] = []
+    for field_key in DEVICE_FIELDS.get(device.type, ()):
+        descriptors.extend(_field_descriptors(field_key, FIELDS[field_key]))
+
+    catalog: dict[Platform, list[EntityDescriptor]] = {}
+    for descriptor in descriptors:
+        catalog.setdefault(descriptor.platform, []).append(descriptor)
+    return {platform: tuple(entries) for platform, entries in catalog.items()}
+
+
+def _field_descriptors(
+    field_key: str, field_config: FieldConfig
+) -> list[EntityDescriptor]:
+    """Get the entity descriptors for a field."""
+    name = field_config.home_assistant_extra.get(CONF_NAME, "")
+
+    if field_config.type == FieldType.NUMERIC:
+        category = None
+        if field_config.setter is True or field_key in DIAGNOSTIC_FIELDS:
+            category = EntityCategory.DIAGNOSTIC
+        return [
+            EntityDescriptor(
+                field_key,
+                Platform.SENSOR,
+                name,
+                category=category,
+                unit_of_measurement=field_config.home_assistant_extra.get(
+                    CONF_UNIT_OF_MEASUREMENT
+                ),
+                device_class=field_config.home_assistant_extra.get(CONF_DEVICE_CLASS),
+                state_class=field_config.home_assistant_extra.get(CONF_STATE_CLASS),
+            )
+        ]
+
+    if field_config.type == FieldType.ENUM:
+        category = None
+        if field_config.setter is True or field_key in DIAGNOSTIC_FIELDS:
+            category = EntityCategory.DIAGNOSTIC
+        options = field_config.home_assistant_extra.get(CONF_OPTIONS)
+        return [
+            EntityDescriptor(
+                field_key,
+                Platform.SENSOR,
+                name,
+                category=category,
+                options=tuple(options) if options is not None else None,
+            )
+        ]
+
+    if field_config.type == FieldType.BOOL:
+        category = None
+        if field_config.setter is True:
+            category = EntityCategory.DIAGNOSTIC
+        descriptors = [
+            EntityDescriptor(field_key, Platform.BINARY_SENSOR, name, category=category)
+        ]
+        if field_config.setter is True and field_key in CONTROL_FIELDS:
+            descriptors.append(EntityDescriptor(field_key, Platform.SWITCH, name))
+        return descriptors
+
+    return []
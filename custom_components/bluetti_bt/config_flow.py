@@ -17,9 +17,11 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
 from . import get_type_by_bt_name
+from .connection import ConnectionMode, get_connection_mode
 from .const import (
+    CONF_CONNECTION_MODE,
     CONF_MAX_RETRIES,
-    CONF_PERSISTENT_CONN,
+    CONF_PACK_POLLING_INTERVAL,
     CONF_POLLING_INTERVAL,
     CONF_POLLING_TIMEOUT,
     CONF_USE_CONTROLS,
@@ -128,16 +130,21 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             if user_input[CONF_MAX_RETRIES] < 1:
                 return self.async_abort(reason="invalid_retries")
 
+            # Validate pack polling interval
+            if user_input[CONF_PACK_POLLING_INTERVAL] < 0:
+                return self.async_abort(reason="invalid_pack_interval")
+
             changed = self.hass.config_entries.async_update_entry(
                 self.config_entry,
                 data={
                     **self.config_entry.data,
                     **{
                         CONF_USE_CONTROLS: user_input[CONF_USE_CONTROLS],
-                        CONF_PERSISTENT_CONN: user_input[CONF_PERSISTENT_CONN],
+                        CONF_CONNECTION_MODE: user_input[CONF_CONNECTION_MODE],
                         CONF_POLLING_INTERVAL: user_input[CONF_POLLING_INTERVAL],
                         CONF_POLLING_TIMEOUT: user_input[CONF_POLLING_TIMEOUT],
                         CONF_MAX_RETRIES: user_input[CONF_MAX_RETRIES],
+                        CONF_PACK_POLLING_INTERVAL: user_input[CONF_PACK_POLLING_INTERVAL],
                     },
                 },
             )
@@ -150,10 +157,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 title="",
                 data={
                     CONF_USE_CONTROLS: user_input[CONF_USE_CONTROLS],
-                    CONF_PERSISTENT_CONN: user_input[CONF_PERSISTENT_CONN],
+                    CONF_CONNECTION_MODE: user_input[CONF_CONNECTION_MODE],
                     CONF_POLLING_INTERVAL: user_input[CONF_POLLING_INTERVAL],
                     CONF_POLLING_TIMEOUT: user_input[CONF_POLLING_TIMEOUT],
                     CONF_MAX_RETRIES: user_input[CONF_MAX_RETRIES],
+                    CONF_PACK_POLLING_INTERVAL: user_input[CONF_PACK_POLLING_INTERVAL],
                 },
             )
 
@@ -166,9 +174,15 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         default=self.config_entry.data.get(CONF_USE_CONTROLS, False),
                     ): selector.BooleanSelector(),
                     vol.Required(
-                        CONF_PERSISTENT_CONN,
-                        default=self.config_entry.data.get(CONF_PERSISTENT_CONN, False),
-                    ): selector.BooleanSelector(),
+                        CONF_CONNECTION_MODE,
+                        default=get_connection_mode(self.config_entry.data).value,
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[mode.value for mode in ConnectionMode],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_CONNECTION_MODE,
+                        )
+                    ),
                     vol.Required(
                         CONF_POLLING_INTERVAL,
                         default=self.config_entry.data.get(CONF_POLLING_INTERVAL, 20),
@@ -181,6 +195,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_MAX_RETRIES,
                         default=self.config_entry.data.get(CONF_MAX_RETRIES, 5),
                     ): int,
+                    vol.Required(
+                        CONF_PACK_POLLING_INTERVAL,
+                        default=self.config_entry.data.get(CONF_PACK_POLLING_INTERVAL, 300),
+                    ): int,
                 }
             ),
         )
@@ -0,0 +1,265 @@
+"""Connection reuse policy for Bluetti devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+import heapq
+import itertools
+import logging
+from typing import Any
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_CONNECTION_MODE,
+    CONF_PERSISTENT_CONN,
+    CONNECT_COST_DEFAULT,
+    CONNECT_COST_IDLE_FACTOR,
+    CONNECT_COST_SMOOTHING,
+    ADAPTER_POLL_STAGGER,
+    ADAPTER_WAIT_SAMPLES,
+    DATA_ADAPTER_SCHEDULER,
+    DATA_CONNECTION_POOL,
+    DOMAIN,
+    MAX_KEPT_CONNECTIONS_PER_ADAPTER,
+    MAX_POLLS_PER_ADAPTER,
+)
+from .metrics import percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionMode(Enum):
+    """When to keep the connection between polls."""
+
+    ALWAYS = "always"  # Never disconnect
+    ADAPTIVE = "adaptive"  # Keep if reconnecting costs more than waiting
+    NEVER = "never"  # Disconnect after every poll
+
+
+def get_connection_mode(data: Mapping[str, Any]) -> ConnectionMode:
+    """Get the connection mode of a config entry.
+
+    Entries created before connection modes only have persistent_conn.
+    """
+    if CONF_CONNECTION_MODE in data:
+        return ConnectionMode(data[CONF_CONNECTION_MODE])
+    if data.get(CONF_PERSISTENT_CONN, False):
+        return ConnectionMode.ALWAYS
+    return ConnectionMode.ADAPTIVE
+
+
+class ConnectionPolicy:
+    """Decides how long an idle connection is kept.
+
+    In adaptive mode the connection is kept for a multiple of the
+    measured connect time. If the next poll is due later than that, the
+    connection is closed right after polling.
+    """
+
+    def __init__(self, mode: ConnectionMode, polling_interval: float) -> None:
+        """Init policy."""
+        self.mode = mode
+        self.polling_interval = polling_interval
+        self.connect_cost = CONNECT_COST_DEFAULT
+        self._measured = False
+
+    def record_connect(self, duration: float) -> None:
+        """Add the time needed to connect and start notifications."""
+        if not self._measured:
+            self.connect_cost = duration
+            self._measured = True
+        else:
+            self.connect_cost += CONNECT_COST_SMOOTHING * (duration - self.connect_cost)
+
+    def idle_timeout(self) -> float | None:
+        """Get seconds to keep an idle connection, None for no limit."""
+        if self.mode is ConnectionMode.ALWAYS:
+            return None
+        if self.mode is ConnectionMode.NEVER:
+            return 0
+        idle_timeout = self.connect_cost * CONNECT_COST_IDLE_FACTOR
+        if idle_timeout <= self.polling_interval:
+            return 0
+        return idle_timeout
+
+
+def get_adapter(hass: HomeAssistant, address: str) -> str:
+    """Get the adapter (or proxy) a device is reached through."""
+    service_info = bluetooth.async_last_service_info(hass, address, connectable=True)
+    if service_info is None:
+        return "unknown"
+    return service_info.source
+
+
+class ConnectionPool:
+    """Limits the idle connections kept per Bluetooth adapter.
+
+    Shared by all config entries.
+    """
+
+    def __init__(self, hass: HomeAssistant, limit: int) -> None:
+        """Init pool."""
+        self.hass = hass
+        self.limit = limit
+        self._kept: dict[str, set[str]] = {}
+
+    def acquire(self, address: str) -> bool:
+        """Try to keep the connection to a device."""
+        adapter = get_adapter(self.hass, address)
+        kept = self._kept.setdefault(adapter, set())
+        if address in kept:
+            return True
+        if len(kept) >= self.limit:
+            _LOGGER.debug("Adapter %s keeps %s connections already", adapter, len(kept))
+            return False
+        kept.add(address)
+        return True
+
+    def release(self, address: str) -> None:
+        """Connection to a device is closed."""
+        for kept in self._kept.values():
+            kept.discard(address)
+
+
+def get_connection_pool(hass: HomeAssistant) -> ConnectionPool:
+    """Get the connection pool shared by all entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CONNECTION_POOL not in domain_data:
+        domain_data[DATA_CONNECTION_POOL] = ConnectionPool(
+            hass, MAX_KEPT_CONNECTIONS_PER_ADAPTER
+        )
+    return domain_data[DATA_CONNECTION_POOL]
+
+
+@dataclass(order=True)
+class _PollRequest:
+    """A device waiting to poll."""
+
+    due: float  # Event loop time the poll was due
+    sequence: int
+    future: asyncio.Future = field(compare=False)
+
+
+class AdapterQueue:
+    """Runs the polls of the devices on one adapter.
+
+    At most `limit` devices poll at the same time and concurrent polls
+    start at least `stagger` seconds apart. Waiting devices are served by how
+    overdue their poll is.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, limit: int, stagger: float) -> None:
+        """Init queue."""
+        self._loop = loop
+        self.limit = limit
+        self.stagger = stagger
+        self.active = 0
+        self._waiting: list[_PollRequest] = []
+        self._sequence = itertools.count()
+        self._last_start = -stagger
+        self._wakeup: asyncio.TimerHandle | None = None
+        self.wait_times: deque[float] = deque(maxlen=ADAPTER_WAIT_SAMPLES)
+
+    @property
+    def depth(self) -> int:
+        """Number of devices waiting to poll."""
+        return sum(1 for request in self._waiting if not request.future.done())
+
+    async def acquire(self, due: float) -> None:
+        """Wait until the device may poll."""
+        request = _PollRequest(due, next(self._sequence), self._loop.create_future())
+        heapq.heappush(self._waiting, request)
+        queued = self._loop.time()
+        self._dispatch()
+        try:
+            await request.future
+        except asyncio.CancelledError:
+            if request.future.done() and not request.future.cancelled():
+                # Slot was granted, but is not used
+                self.release()
+            raise
+        self.wait_times.append(self._loop.time() - queued)
+
+    def release(self) -> None:
+        """Poll finished."""
+        self.active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, due: float) -> AsyncIterator[None]:
+        """Hold a poll slot."""
+        await self.acquire(due)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def summary(self) -> dict[str, Any]:
+        """Get queue depth and wait times in milliseconds."""
+        wait_times = sorted(self.wait_times)
+        summary: dict[str, Any] = {"depth": self.depth, "active": self.active}
+        for percent in (50, 95):
+            value = percentile(wait_times, percent)
+            summary[f"wait_p{percent}"] = (
+                round(value * 1000, 1) if value is not None else None
+            )
+        return summary
+
+    def _dispatch(self) -> None:
+        """Start waiting polls if there is a free slot."""
+        while self._waiting and self.active < self.limit:
+            request = self._waiting[0]
+            if request.future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiting)
+                continue
+            start = self._last_start + self.stagger
+            now = self._loop.time()
+            if self.active > 0 and now < start:
+                if self._wakeup is None:
+                    self._wakeup = self._loop.call_at(start, self._on_wakeup)
+                return
+            heapq.heappop(self._waiting)
+            self.active += 1
+            self._last_start = now
+            request.future.set_result(None)
+
+    def _on_wakeup(self) -> None:
+        """Stagger time passed."""
+        self._wakeup = None
+        self._dispatch()
+
+
+class AdapterScheduler:
+    """Schedules the polls of all entries per Bluetooth adapter."""
+
+    def __init__(self, hass: HomeAssistant, limit: int, stagger: float) -> None:
+        """Init scheduler."""
+        self.hass = hass
+        self.limit = limit
+        self.stagger = stagger
+        self.queues: dict[str, AdapterQueue] = {}
+
+    def queue(self, address: str) -> AdapterQueue:
+        """Get the queue of the adapter a device is reached through."""
+        adapter = get_adapter(self.hass, address)
+        if adapter not in self.queues:
+            self.queues[adapter] = AdapterQueue(self.hass.loop, self.limit, self.stagger)
+        return self.queues[adapter]
+
+
+def get_adapter_scheduler(hass: HomeAssistant) -> AdapterScheduler:
+    """Get the adapter scheduler shared by all entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_ADAPTER_SCHEDULER not in domain_data:
+        domain_data[DATA_ADAPTER_SCHEDULER] = AdapterScheduler(
+            hass, MAX_POLLS_PER_ADAPTER, ADAPTER_POLL_STAGGER
+        )
+    return domain_data[DATA_ADAPTER_SCHEDULER]
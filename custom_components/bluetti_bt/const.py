@@ -1,6 +1,6 @@
 """Constants for the Bluetti BT integration."""
 
-from bluetti_mqtt.mqtt_client import MqttFieldConfig, MqttFieldType
+from .fields import FieldConfig, FieldType
 
 DOMAIN = "bluetti_bt"
 MANUFACTURER = "Bluetti"
@@ -8,12 +8,105 @@ MANUFACTURER = "Bluetti"
 CONF_OPTIONS = "options"
 CONF_USE_CONTROLS = "use_controls"
 CONF_PERSISTENT_CONN = "persistent_conn"
+CONF_CONNECTION_MODE = "connection_mode"
 CONF_POLLING_INTERVAL = "polling_interval"
 CONF_POLLING_TIMEOUT = "polling_timeout"
 CONF_MAX_RETRIES = "max_retries"
+CONF_PACK_POLLING_INTERVAL = "pack_polling_interval"
+
+ATTR_ADDRESS = "address"
+ATTR_VALUES = "values"
+ATTR_STALE = "stale"
+
+SERVICE_WRITE_REGISTERS = "write_registers"
 
 DATA_COORDINATOR = "coordinator"
+DATA_DEVICE = "device"
 DATA_POLLING_RUNNING = "polling_running"
+DATA_CONNECTION_POOL = "connection_pool"
+DATA_ADAPTER_SCHEDULER = "adapter_scheduler"
+
+# Storage of the last polled data, restored on startup
+SNAPSHOT_STORAGE_VERSION = 1
+# Max seconds between polling and storing the data
+SNAPSHOT_SAVE_DELAY = 60
+
+# Max unused registers between two ranges to still read them together
+POLLING_MAX_REGISTER_GAP = 16
+
+# Assumed seconds to connect until the first connection is measured
+CONNECT_COST_DEFAULT = 4
+# Weight of a new connect time in the running average
+CONNECT_COST_SMOOTHING = 0.3
+# Adaptive connections are kept for this many times the connect time
+CONNECT_COST_IDLE_FACTOR = 10
+# Idle connections kept per Bluetooth adapter, over all devices
+MAX_KEPT_CONNECTIONS_PER_ADAPTER = 2
+
+# Seconds to wait before the first connect retry, doubled for every retry
+CONNECT_BACKOFF_BASE = 1
+# Maximum seconds between connect retries
+CONNECT_BACKOFF_MAX = 10
+
+# Seconds without advertisement or response after which a device is
+# considered out of range and not connected to
+ADVERTISEMENT_MAX_AGE = 180
+# Polls which have to connect wait for the next advertisement if the last
+# one is older than this many seconds
+ADVERTISEMENT_FRESH = 2
+# Maximum seconds to wait for the next advertisement before connecting
+ADVERTISEMENT_WAIT = 5
+
+# Failed polls in a row after which a device is considered unreachable
+BREAKER_FAILURE_THRESHOLD = 3
+# Seconds until polling an unreachable device is tried again
+BREAKER_RESET_TIMEOUT = 60
+# Maximum seconds between tries to poll an unreachable device
+BREAKER_MAX_RESET_TIMEOUT = 900
+
+# Devices polling at the same time per Bluetooth adapter
+MAX_POLLS_PER_ADAPTER = 2
+# Minimum seconds between poll starts on the same adapter
+ADAPTER_POLL_STAGGER = 1
+# Number of queue wait times kept per adapter
+ADAPTER_WAIT_SAMPLES = 100
+
+# Seconds to collect writes before sending them together
+WRITE_COALESCE_WINDOW = 0.1
+# Seconds between reads while waiting for a written value
+WRITE_VERIFY_INTERVAL = 0.25
+# Seconds to wait for a written value to show
+WRITE_VERIFY_TIMEOUT = 5
+
+# Failed commands sent again per polling cycle or write
+COMMAND_RETRY_BUDGET = 3
+# Max seconds to wait before sending failed commands again
+COMMAND_RETRY_MAX_DELAY = 1
+# Commands time out after this many times their 95th percentile duration
+COMMAND_TIMEOUT_FACTOR = 3
+# Min seconds to wait for a response
+COMMAND_MIN_TIMEOUT = 0.5
+
+# Share of the polling timeout given to the commands of a cycle, so they
+# fail on their own before the whole cycle times out
+POLLING_BUDGET_SHARE = 0.9
+# Share of the cycle budget low priority commands leave for high priority
+# commands and their retries
+POLLING_LOW_PRIORITY_RESERVE = 0.1
+
+# Seconds a response may arrive after its request timed out, it is
+# discarded instead of being taken for the response to the next request
+LATE_RESPONSE_TIMEOUT = 2
+
+# Number of commands kept for latency metrics
+COMMAND_METRICS_SIZE = 200
+
+# Polling interval in seconds for fields which rarely change
+SLOW_POLLING_INTERVAL = 60
+
+# Fields are unavailable if not read for this many polling intervals, plus
+# the polling timeout
+FIELD_MAX_AGE_FACTOR = 3
 
 CONTROL_FIELDS = [
     "ac_output_on",
@@ -30,59 +123,122 @@ DIAGNOSTIC_FIELDS = [
     "high_voltage_module_version",
 ]
 
+# Changes smaller than this are not written to the state machine
+FIELD_DEADBANDS = {
+    "dc_input_power": 5,
+    "ac_input_power": 5,
+    "ac_output_power": 5,
+    "dc_output_power": 5,
+    "pv_input_power1": 5,
+    "pv_input_power2": 5,
+}
+
+# Battery packs are read again if one of these fields changed, they are
+# always polled while packs are polled
+PACK_SUMMARY_FIELDS = [
+    "total_battery_percent",
+    "dc_input_power",
+    "ac_input_power",
+    "ac_output_power",
+    "dc_output_power",
+]
+
+# Fields which never change, only read once
+STATIC_FIELDS = [
+    "device_type",
+    "serial_number",
+    "arm_version",
+    "dsp_version",
+    "bcu_version",
+    "bmu_version",
+    "safety_module_version",
+    "high_voltage_module_version",
+    "pack_bms_version",
+    "battery_type",
+    "battery_serial_number",
+    "pack_num_max",
+    "max_ac_input_power",
+    "max_ac_input_current",
+    "max_ac_output_power",
+    "max_ac_output_current",
+]
+
+# Pack, cell and settings fields, polled with SLOW_POLLING_INTERVAL
+SLOW_FIELDS = [
+    "cell_voltages",
+    "pack_status",
+    "pack_voltage",
+    "pack_battery_percent",
+    "power_generation",
+    "battery_range_start",
+    "battery_range_end",
+    "ups_mode",
+    "split_phase_on",
+    "split_phase_machine_mode",
+    "grid_charge_on",
+    "time_control_on",
+    "auto_sleep_mode",
+    "led_mode",
+    "eco_on",
+    "eco_shutdown",
+    "charging_mode",
+    "power_lifting_on",
+]
+
+# Run scripts/generate_field_table.py after changing these
 ADDITIONAL_DEVICE_FIELDS = {
-    "max_ac_input_power": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "max_ac_input_power": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Max AC Input Power per Phase",
         },
     ),
-    "max_ac_input_current": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "max_ac_input_current": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Max AC Input Current per Phase",
         },
     ),
-    "max_ac_output_power": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "max_ac_output_power": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Max AC Output Power per Phase",
         },
     ),
-    "max_ac_output_current": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "max_ac_output_current": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Max AC Output Current per Phase",
         },
     ),
-    "bcu_version": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "bcu_version": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={"name": "BCU Version"},
     ),
-    "safety_module_version": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "safety_module_version": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={"name": "Safety Module Version"},
     ),
-    "high_voltage_module_version": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "high_voltage_module_version": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={"name": "High Voltage Safety Module Version"},
     ),
-    'pv_input_power1': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_power1': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -93,8 +249,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    'pv_input_voltage1': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_voltage1': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -105,8 +261,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    'pv_input_current1': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_current1': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -117,8 +273,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    'pv_input_power2': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_power2': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -129,8 +285,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    'pv_input_voltage2': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_voltage2': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -141,8 +297,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    'pv_input_current2': MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    'pv_input_current2': FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -153,8 +309,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_power_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_power_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -165,8 +321,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_power_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_power_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -177,8 +333,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_power_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_power_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -189,8 +345,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_voltage_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_voltage_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -201,8 +357,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_voltage_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_voltage_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -213,8 +369,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "adl400_ac_input_voltage_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "adl400_ac_input_voltage_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -225,8 +381,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_voltage_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_voltage_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -237,8 +393,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_voltage_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_voltage_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -249,8 +405,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_voltage_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_voltage_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -261,8 +417,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_current_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_current_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -273,8 +429,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_current_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_current_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -285,8 +441,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_current_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_current_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -297,8 +453,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_power_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_power_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -309,8 +465,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_power_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_power_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -321,8 +477,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "grid_input_power_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "grid_input_power_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -333,8 +489,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_frequency": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_frequency": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -345,8 +501,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_voltage_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_voltage_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -357,8 +513,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_voltage_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_voltage_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -369,8 +525,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_voltage_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_voltage_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -381,8 +537,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_power_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_power_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -393,8 +549,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_power_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_power_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -405,8 +561,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_power_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_power_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -417,8 +573,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_current_phase1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_current_phase1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -429,8 +585,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_current_phase2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_current_phase2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -441,8 +597,8 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "ac_output_current_phase3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "ac_output_current_phase3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
@@ -453,80 +609,80 @@ ADDITIONAL_DEVICE_FIELDS = {
             "force_update": True,
         },
     ),
-    "testing0": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing0": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 0",
         },
     ),
-    "testing1": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing1": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 1",
         },
     ),
-    "testing2": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing2": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 2",
         },
     ),
-    "testing3": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing3": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 3",
         },
     ),
-    "testing4": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing4": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 4",
         },
     ),
-    "testing5": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing5": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 5",
         },
     ),
-    "testing6": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing6": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 6",
         },
     ),
-    "testing7": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing7": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 7",
         },
     ),
-    "testing8": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing8": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
             "name": "Register Testing 8",
         },
     ),
-    "testing9": MqttFieldConfig(
-        type=MqttFieldType.NUMERIC,
+    "testing9": FieldConfig(
+        type=FieldType.NUMERIC,
         setter=False,
         advanced=False,
         home_assistant_extra={
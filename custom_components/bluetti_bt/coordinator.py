@@ -1,17 +1,23 @@
 """Coordinator for Bluetti integration."""
 
 from __future__ import annotations
-from typing import List, cast
+from typing import Any, List
 
 import asyncio
-from datetime import timedelta
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import partial
 import logging
+import struct
+import time
 import async_timeout
 
 from bleak import BleakClient, BleakError
 
 from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
@@ -24,13 +30,97 @@ from bluetti_mqtt.bluetooth import (
     build_device,
 )
 from bluetti_mqtt.core.devices.bluetti_device import BluettiDevice
-from bluetti_mqtt.core.commands import ReadHoldingRegisters
+from bluetti_mqtt.core.devices.struct import DeviceStruct, EnumField
+from bluetti_mqtt.core.commands import DeviceCommand, ReadHoldingRegisters
 
-from .const import DATA_POLLING_RUNNING, DOMAIN
+from .breaker import CircuitBreaker, backoff_delay
+from .connection import (
+    ConnectionMode,
+    ConnectionPolicy,
+    get_adapter_scheduler,
+    get_connection_pool,
+)
+from .const import (
+    ADVERTISEMENT_FRESH,
+    ADVERTISEMENT_MAX_AGE,
+    ADVERTISEMENT_WAIT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT,
+    CONNECT_BACKOFF_BASE,
+    CONNECT_BACKOFF_MAX,
+    COMMAND_METRICS_SIZE,
+    COMMAND_RETRY_BUDGET,
+    COMMAND_RETRY_MAX_DELAY,
+    COMMAND_MIN_TIMEOUT,
+    COMMAND_TIMEOUT_FACTOR,
+    DATA_POLLING_RUNNING,
+    DOMAIN,
+    FIELD_DEADBANDS,
+    FIELD_MAX_AGE_FACTOR,
+    LATE_RESPONSE_TIMEOUT,
+    PACK_SUMMARY_FIELDS,
+    POLLING_BUDGET_SHARE,
+    POLLING_LOW_PRIORITY_RESERVE,
+    POLLING_MAX_REGISTER_GAP,
+    SLOW_POLLING_INTERVAL,
+    WRITE_COALESCE_WINDOW,
+    WRITE_VERIFY_INTERVAL,
+    WRITE_VERIFY_TIMEOUT,
+)
+from .metrics import CommandMetrics, CommandSample
+from .modbus import PendingRequest, PendingWrite, RequestQueue
+from .packs import PackCache
+from .registers import (
+    CoalescedRead,
+    build_register_map,
+    plan_reads,
+    plan_writes,
+    written_registers,
+)
+from .scheduler import (
+    TIER_PRIORITIES,
+    CommandPriority,
+    CycleBudget,
+    PollingTier,
+    TierScheduler,
+    field_tier,
+)
+from .snapshot import SnapshotStore
+from .state import FieldStates
 from .utils import mac_loggable
 
 _LOGGER = logging.getLogger(__name__)
 
+# Field structs by device type, shared by all entries of the same type
+_DEVICE_STRUCTS: dict[str, DeviceStruct] = {}
+
+
+def value_changed(old: Any, new: Any, deadband: float = 0) -> bool:
+    """Check if a value changed by more than the deadband."""
+    if (
+        deadband > 0
+        and isinstance(old, (int, float, Decimal))
+        and isinstance(new, (int, float, Decimal))
+        and not isinstance(old, bool)
+        and not isinstance(new, bool)
+    ):
+        return abs(new - old) >= deadband
+    return old != new
+
+
+def pack_summary_changed(old: tuple, new: tuple) -> bool:
+    """Check if the battery summary changed enough to read the packs again."""
+    return any(
+        value_changed(old_value, new_value, FIELD_DEADBANDS.get(key, 0))
+        for key, old_value, new_value in zip(PACK_SUMMARY_FIELDS, old, new)
+    )
+
+
+def build_dummy_device(address: str, device_name: str) -> DummyDevice:
+    """Build the device model for a config entry."""
+    return DummyDevice(build_device(address, device_name))
+
 
 class DummyDevice(BluettiDevice):
     """Dummy device used to add more fields to existing devices.
@@ -41,9 +131,19 @@ class DummyDevice(BluettiDevice):
 
     def __init__(self, device: BluettiDevice):
         """Init dummy device with real device."""
-        self.struct = device.struct
+        if device.type in _DEVICE_STRUCTS:
+            self.struct = _DEVICE_STRUCTS[device.type]
+        else:
+            self.struct = device.struct
+            self._add_fields(device.type)
+            _DEVICE_STRUCTS[device.type] = self.struct
 
-        if device.type == "EP600":
+        super().__init__(device.address, device.type, device.sn)
+        self._parent = device
+
+    def _add_fields(self, device_type: str):
+        """Add fields to the struct of the device type."""
+        if device_type == "EP600":
             # DC Solar Input (copied from PR https://github.com/warhammerkid/bluetti_mqtt/pull/87 by KM011092)
             self.struct.add_uint_field('pv_input_power1', 1212)  # MPP 1 in - value * 0.1
             #self.struct.add_uint_field('pv_input_voltage1', 1213)  # MPP 1 in  - value * 0.1
@@ -81,9 +181,6 @@ class DummyDevice(BluettiDevice):
             self.struct.add_decimal_field("ac_output_current_phase2", 1519, 1)
             self.struct.add_decimal_field("ac_output_current_phase3", 1526, 1)
 
-        super().__init__(device.address, device.type, device.sn)
-        self._parent = device
-
     @property
     def pack_num_max(self):
         return self._parent.pack_num_max
@@ -124,6 +221,20 @@ class DummyDevice(BluettiDevice):
     def writable_ranges(self) -> List[range]:
         return self._parent.writable_ranges
 
+    @property
+    def max_read_registers(self) -> int:
+        """Largest amount of registers to read with a single command.
+
+        bluetti_mqtt already sends reads of this size to the device,
+        so responses of this length are known to work.
+        """
+        commands = self.polling_commands + self.pack_polling_commands
+        try:
+            commands = commands + self.logging_commands + self.pack_logging_commands
+        except NotImplementedError:
+            pass
+        return max(command.quantity for command in commands)
+
 
 class PollingCoordinator(DataUpdateCoordinator):
     """Polling coordinator."""
@@ -132,11 +243,12 @@ class PollingCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         address: str,
-        device_name: str,
+        bluetti_device: DummyDevice,
         polling_interval: int,
-        persistent_conn: bool,
+        connection_mode: ConnectionMode,
         polling_timeout: int,
         max_retries: int,
+        pack_polling_interval: int,
     ):
         """Initialize coordinator."""
         super().__init__(
@@ -147,34 +259,126 @@ class PollingCoordinator(DataUpdateCoordinator):
         )
         self._address = address
         self.has_notifier = False
-        self.notify_future = None
-        self.current_command = None
-        self.notify_response = bytearray()
-        bluetti_device = build_device(address, device_name)
-        self.persistent_conn = persistent_conn
+        self.request_queue = RequestQueue(LATE_RESPONSE_TIMEOUT)
+        self._retry_budget = COMMAND_RETRY_BUDGET
+        self._cycle_budget: CycleBudget | None = None
+        self.dropped_commands = 0
+        self.command_metrics = CommandMetrics(COMMAND_METRICS_SIZE)
+        self.connection_policy = ConnectionPolicy(connection_mode, polling_interval)
+        self.connection_pool = get_connection_pool(hass)
+        self.adapter_scheduler = get_adapter_scheduler(hass)
+        self._next_due: float | None = None
+
+        # Polls fail fast while the device is unreachable
+        self.circuit_breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT, BREAKER_MAX_RESET_TIMEOUT
+        )
+
+        # Presence from advertisements
+        self.rssi: int | None = None
+        self._last_seen = (
+            time.monotonic()
+            if bluetooth.async_address_present(hass, address)
+            else float("-inf")
+        )
+        self._last_advertisement = float("-inf")
+        self._next_advertisement: asyncio.Future | None = None
+        self._cancel_advertisements: CALLBACK_TYPE | None = None
+        self._cancel_idle_disconnect: CALLBACK_TYPE | None = None
+        self._connection_uses = 0
         self.polling_timeout = polling_timeout
         self.max_retries = max_retries
 
-        # Add or modify device fields
-        self.bluetti_device = DummyDevice(bluetti_device)
+        self.bluetti_device = bluetti_device
 
-        # Create client
+        # Fields used by enabled entities, polling is limited to those
+        self._field_demand: dict[str, int] = {}
+        self.register_map = build_register_map(
+            self.bluetti_device, self.bluetti_device.polling_commands
+        )
+        self.pack_register_map = build_register_map(
+            self.bluetti_device, self.bluetti_device.pack_polling_commands
+        )
+        self.polling_ranges: dict[PollingTier, list[ReadHoldingRegisters]] = {}
+        self._range_tiers: dict[tuple[int, int], set[PollingTier]] = {}
+        self._polling_plans: dict[frozenset[PollingTier], list[CoalescedRead]] = {}
+        self.polling_packs = []
+        self._polling_plan_outdated = True
+
+        # Fast fields are polled every cycle, static fields only once
+        self.tier_scheduler = TierScheduler(
+            {
+                PollingTier.FAST: 0,
+                PollingTier.SLOW: SLOW_POLLING_INTERVAL,
+                PollingTier.STATIC: None,
+            }
+        )
+
+        # Last value of every field, kept if a poll fails
+        self.field_states = FieldStates()
+
+        # Last polled data, stored across restarts
+        self.snapshot: SnapshotStore | None = None
+        self.stale = False
+        self._cancel_stale: CALLBACK_TYPE | None = None
+
+        # Create client, the device is looked up on connect if not in range
         self.logger.debug("Creating client")
         device = bluetooth.async_ble_device_from_address(hass, address)
-        if device is None:
-            self.logger.error("Device %s not available", mac_loggable(address))
-            return None
-        self.client = BleakClient(device)
+        self.client = BleakClient(device or address)
+
+        # Entities are only notified if their key changed
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._published: dict[str, Any] = {}
+        self._published_available: dict[str, bool] = {}
+        self._published_stale = False
+        self._remove_key_dispatcher: CALLBACK_TYPE | None = None
+
+        # Battery packs are only read if changed or outdated
+        self.pack_cache = PackCache(pack_polling_interval, pack_summary_changed)
 
         # polling mutex to guard against switches
         self.polling_lock = asyncio.Lock()
 
+        # Writes waiting to be sent together
+        self._pending_writes: list[PendingWrite] = []
+        self._flush_writes: asyncio.TimerHandle | None = None
+
+    @property
+    def persistent_conn(self) -> bool:
+        """Return if the connection is never closed."""
+        return self.connection_policy.mode is ConnectionMode.ALWAYS
+
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        # Fail fast while the device is unreachable
+        if not self.circuit_breaker.allow(time.monotonic()):
+            self.logger.debug(
+                "Skipping poll of unreachable device %s", mac_loggable(self._address)
+            )
+            return self.field_states.values() or None
+
+        # Wait for the next advertisement instead of trying to connect
+        if not self.device_present and not self.client.is_connected:
+            self.logger.debug(
+                "Device %s not seen recently, waiting for an advertisement",
+                mac_loggable(self._address),
+            )
+            return self.field_states.values() or None
+
+        # Connect right after an advertisement, when the device is known to
+        # be in range
+        if (
+            self._cancel_advertisements is not None
+            and not self.client.is_connected
+            and time.monotonic() - self._last_advertisement > ADVERTISEMENT_FRESH
+        ):
+            await self._async_wait_advertisement()
+
         self.hass.data[DOMAIN][self.config_entry.entry_id][DATA_POLLING_RUNNING] = True
 
         self.logger.debug("Polling data")
@@ -183,64 +387,97 @@ class PollingCoordinator(DataUpdateCoordinator):
             self.logger.error("Device type for %s not found", mac_loggable(self._address))
             return None
 
-        parsed_data: dict = {}
+        if self._polling_plan_outdated:
+            self._update_polling_plan()
 
-        async with self.polling_lock:
+        started = time.monotonic()
+        due_tiers = self.tier_scheduler.due_tiers(started)
+        self.logger.debug("Polling tiers: %s", [tier.value for tier in due_tiers])
+
+        # Devices on the same adapter poll one after the other, the most
+        # overdue first
+        now = self.hass.loop.time()
+        due = self._next_due if self._next_due is not None else now
+        self._next_due = now + self.update_interval.total_seconds()
+        adapter_queue = self.adapter_scheduler.queue(self._address)
+
+        async with self.polling_lock, adapter_queue.slot(due):
+            self._connection_uses += 1
+            self._retry_budget = COMMAND_RETRY_BUDGET
+            if self._cancel_idle_disconnect is not None:
+                self._cancel_idle_disconnect()
+                self._cancel_idle_disconnect = None
+
+            # Commands stop before the cycle times out, low priority
+            # ones are dropped first
+            budget = self._cycle_budget = CycleBudget(
+                self.hass.loop.time(),
+                POLLING_BUDGET_SHARE * self.polling_timeout,
+                POLLING_LOW_PRIORITY_RESERVE,
+            )
+            # Tiers with reads which returned nothing
+            failed_tiers: set[PollingTier] = set()
             try:
                 async with async_timeout.timeout(self.polling_timeout):
 
-                    # Reconnect if not connected
-                    for attempt in range(1, self.max_retries + 1):
-                        try:
-                            if not self.client.is_connected:
-                                await self.client.connect()
-                            break
-                        except Exception as e:
-                            if attempt == self.max_retries or attempt == 1:
-                                raise  # pass exception on max_retries attempt
-                            else:
-                                self.logger.warning(f"Connect unsucessful (attempt {attempt}): {e}. Retrying...")
-                                await asyncio.sleep(2)
+                    if await self._async_connect() and self.persistent_conn:
+                        # Read static fields once per connection
+                        self.tier_scheduler.reset(PollingTier.STATIC)
+                        due_tiers.add(PollingTier.STATIC)
 
-                    # Attach notifier if needed
-                    if not self.has_notifier:
-                        await self.client.start_notify(
-                            BluetoothClient.NOTIFY_UUID, self._notification_handler
-                        )
-                        self.has_notifier = True
+                    reads = self._polling_plan(due_tiers)
 
-                    for command in self.bluetti_device.polling_commands:
-                        try:
-                            body = command.parse_response(
-                                await self.async_send_command(command)
-                            )
-                            self.logger.debug("Raw data: %s", body)
-                            parsed = self.bluetti_device.parse(
-                                command.starting_address, body
-                            )
-                            self.logger.debug("Parsed data: %s", parsed)
-                            parsed_data.update(parsed)
+                    @callback
+                    def handle_read(index: int, body: memoryview | bytes) -> None:
+                        """Parse a read and note the tiers it failed for."""
+                        if not self._async_handle_read(reads[index], body):
+                            failed_tiers.update(self._read_tiers(reads[index]))
 
-                        except ParseError:
-                            self.logger.warning("Got a parse exception...")
+                    await self.async_send_commands(
+                        [read.command for read in reads],
+                        handle_read,
+                        [self._read_priority(read) for read in reads],
+                    )
 
-                    if len(self.bluetti_device.pack_polling_commands) > 0:
+                    if PollingTier.SLOW in due_tiers and len(self.polling_packs) > 0:
                         self.logger.debug("Polling battery packs")
                         # pack polling
-                        for pack in range (1, self.bluetti_device.pack_num_max + 1):
-                            # Set current pack number
-                            await self.async_send_command(
-                                self.bluetti_device.build_setter_command('pack_num', pack)
+                        pack_summary = tuple(
+                            self.field_states.value(key) for key in PACK_SUMMARY_FIELDS
+                        )
+                        for pack in self.polling_packs:
+                            # Skip packs which have not changed
+                            if self.pack_cache.get(pack, pack_summary, started) is not None:
+                                self.logger.debug("Using cached data for pack %s", pack)
+                                continue
+
+                            pack_commands = self.bluetti_device.pack_polling_commands
+                            pack_setter = self.bluetti_device.build_setter_command('pack_num', pack)
+                            expected = sum(
+                                self._expected_duration(command)
+                                for command in (pack_setter, *pack_commands)
                             )
+                            if not budget.allows(
+                                CommandPriority.LOW, expected, self.hass.loop.time()
+                            ):
+                                self.logger.debug("Not enough time left to poll pack %s", pack)
+                                budget.drop(pack_setter, *pack_commands)
+                                failed_tiers.add(PollingTier.SLOW)
+                                continue
+
+                            # Set current pack number
+                            await self.async_send_command(pack_setter)
 
-                            for command in self.bluetti_device.pack_polling_commands:
-                                # Request & parse result for each pack
+                            pack_data = {}
+                            pack_responses = await self.async_send_commands(
+                                pack_commands,
+                                priorities=[CommandPriority.LOW] * len(pack_commands),
+                            )
+                            for command, body in zip(pack_commands, pack_responses):
+                                # Parse result for each pack
                                 try:
-                                    body = command.parse_response(
-                                        await self.async_send_command(command)
-                                    )
                                     parsed = self.bluetti_device.parse(
-                                        command.starting_address, body
+                                        command.starting_address, bytes(body)
                                     )
                                     self.logger.debug("Parsed data: %s", parsed)
 
@@ -249,95 +486,879 @@ class PollingCoordinator(DataUpdateCoordinator):
                                         self.logger.debug("Parsed pack_num(%s) does not match expected '%s'", pack_number, pack)
                                         continue
 
-                                    for key, value in parsed.items():
-                                        parsed_data.update({key+str(pack):value})
+                                    values = {key + str(pack): value for key, value in parsed.items()}
+                                    self.field_states.update(
+                                        values, f"pack {pack} {command}", time.monotonic()
+                                    )
+                                    self._async_publish_values(values.keys())
+                                    pack_data.update(values)
 
                                 except ParseError:
                                     self.logger.warning("Got a parse exception...")
 
+                            if len(pack_data) > 0:
+                                self.pack_cache.update(pack, pack_data, pack_summary, started)
+                            else:
+                                failed_tiers.add(PollingTier.SLOW)
+
             except TimeoutError:
                 self.logger.warning("Polling timed out for device %s", mac_loggable(self._address))
-                return None
+                self.circuit_breaker.record_failure(time.monotonic())
+                self._end_stale()
+                # Keep what was read, fields not read become unavailable
+                # once they are too old
+                return self.field_states.values() or None
             except BleakError as err:
                 self.logger.warning("Bleak error: %s", err)
-                return None
+                self.circuit_breaker.record_failure(time.monotonic())
+                self._end_stale()
+                return self.field_states.values() or None
             finally:
-                # Disconnect if connection not persistant
-                if not self.persistent_conn:
-                    if self.has_notifier:
-                        await self.client.stop_notify(BluetoothClient.NOTIFY_UUID)
-                        self.has_notifier = False
-                    await self.client.disconnect()
+                self._cycle_budget = None
+                self.dropped_commands += len(budget.dropped)
+                await self._async_release_connection()
 
             self.hass.data[DOMAIN][self.config_entry.entry_id][DATA_POLLING_RUNNING] = False
+            self.circuit_breaker.record_success()
+            self._last_seen = time.monotonic()
+            if budget.dropped:
+                self.logger.debug(
+                    "Dropped %s low priority commands to finish in time",
+                    len(budget.dropped),
+                )
+            if failed_tiers:
+                # Poll tiers with failed or dropped reads again in the next cycle
+                self.logger.debug(
+                    "Not all reads of tiers %s succeeded",
+                    [tier.value for tier in failed_tiers],
+                )
+            self.tier_scheduler.mark_polled(due_tiers - failed_tiers, started)
+            self._end_stale()
+            parsed_data = self.field_states.values()
+            if self.snapshot is not None:
+                self.snapshot.async_schedule_save(parsed_data)
 
             # Pass data back to sensors
             return parsed_data
 
-    async def async_send_command(self, command: ReadHoldingRegisters) -> bytes:
-        """Send command and return response"""
+    @callback
+    def _async_handle_read(self, read: CoalescedRead, body: memoryview | bytes) -> bool:
+        """Parse the response to a read and pass the values on right away.
+
+        Entities don't have to wait for the rest of the cycle. Returns
+        False if the read failed.
+        """
+        if not body:
+            return False
         try:
-            # Prepare to make request
-            self.current_command = command
-            self.notify_future = self.hass.loop.create_future()
-            self.notify_response = bytearray()
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Raw data: %s", bytes(body))
+            for address, part in read.split(body):
+                parsed = self.bluetti_device.parse(address, part)
+                self.logger.debug("Parsed data: %s", parsed)
+                self.field_states.update(parsed, str(read.command), time.monotonic())
+                self._async_publish_values(parsed.keys())
+
+        except ParseError:
+            self.logger.warning("Got a parse exception...")
+            return False
+        return True
+
+    async def async_restore_snapshot(self) -> bool:
+        """Use the data stored by the last run until the first poll.
+
+        The restored fields count as read now. They are shown regardless
+        of their age until the first poll finished or failed, at most for
+        the polling timeout. Returns True if there was stored data.
+        """
+        self.snapshot = SnapshotStore(
+            self.hass, self.config_entry.entry_id, self.bluetti_device
+        )
+        data = await self.snapshot.async_load()
+        if not data:
+            return False
+        self.logger.debug("Restored %s fields", len(data))
+        self.field_states.update(data, "snapshot", time.monotonic())
+        self.data = data
+        self.stale = True
+        self._cancel_stale = async_call_later(
+            self.hass, self.polling_timeout, self._async_stale_timeout
+        )
+        return True
+
+    @callback
+    def _end_stale(self) -> None:
+        """Stop showing restored fields regardless of their age."""
+        self.stale = False
+        if self._cancel_stale is not None:
+            self._cancel_stale()
+            self._cancel_stale = None
+
+    @callback
+    def _async_stale_timeout(self, _now: datetime) -> None:
+        """No poll finished in time after restoring, let restored fields expire."""
+        self._cancel_stale = None
+        if self.stale:
+            self._end_stale()
+            self._async_dispatch_key_updates()
+
+    async def _async_connect(self) -> bool:
+        """Connect and start notifications if needed.
+
+        Returns True if a new connection was made.
+        """
+        connect_started: float | None = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                if not self.client.is_connected:
+                    connect_started = time.monotonic()
+                    self.has_notifier = False
+                    await self.client.connect()
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise  # pass exception on max_retries attempt
+                delay = backoff_delay(attempt, CONNECT_BACKOFF_BASE, CONNECT_BACKOFF_MAX)
+                self.logger.warning(
+                    "Connect unsucessful (attempt %s): %s. Retrying in %.1f seconds...",
+                    attempt,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+        if connect_started is not None:
+            # Late responses on the old connection will not arrive
+            self.request_queue.clear_expired()
+
+        # Attach notifier if needed
+        if not self.has_notifier:
+            await self.client.start_notify(
+                BluetoothClient.NOTIFY_UUID, self._notification_handler
+            )
+            self.has_notifier = True
+
+        if connect_started is None:
+            return False
+        self.connection_policy.record_connect(time.monotonic() - connect_started)
+        return True
+
+    async def async_write_field(self, key: str, value: Any) -> bool:
+        """Write a field and wait until the device reports the new value.
+
+        Returns False if the write failed or the value did not change in
+        time.
+        """
+        command = self.bluetti_device.build_setter_command(key, value)
+        # Enum values are written by name, but read back as members
+        field = next(f for f in self.bluetti_device.struct.fields if f.name == key)
+        if isinstance(field, EnumField):
+            value = field.enum[value]
+        return await self.async_write_registers(
+            {command.address: command.value}, {key: value}
+        )
+
+    async def async_write_registers(
+        self, registers: dict[int, int], fields: dict[str, Any] | None = None
+    ) -> bool:
+        """Queue register writes and wait until they are verified.
+
+        Writes queued within a short window are sent together. Written
+        fields are verified by their value, other registers by their raw
+        value.
+        """
+        for address in registers:
+            if not any(address in writable for writable in self.bluetti_device.writable_ranges):
+                raise ValueError(f"Register {address} is not writable")
+
+        write = PendingWrite(dict(registers), fields or {}, self.hass.loop.create_future())
+        self._pending_writes.append(write)
+        if self._flush_writes is None:
+            self._flush_writes = self.hass.loop.call_later(
+                WRITE_COALESCE_WINDOW,
+                lambda: self.hass.async_create_task(self._async_flush_writes()),
+            )
+        return await write.future
+
+    async def _async_flush_writes(self) -> None:
+        """Send all queued writes on one connection and verify them."""
+        self._flush_writes = None
+        writes, self._pending_writes = self._pending_writes, []
+
+        # Later writes to the same register win
+        registers: dict[int, int] = {}
+        for write in writes:
+            registers.update(write.registers)
+        commands = plan_writes(registers, self.bluetti_device.writable_ranges)
+
+        # Writes overwritten by a later one can not show
+        superseded = [
+            write
+            for write in writes
+            if any(registers[address] != value for address, value in write.registers.items())
+        ]
+        for write in superseded:
+            self.logger.debug("Write %s replaced by a later one", write.registers)
+            write.future.set_result(False)
+            writes.remove(write)
+
+        failed: set[int] = set()
+        # Writes wait for the adapter like polls, but are served first
+        adapter_queue = self.adapter_scheduler.queue(self._address)
+        async with self.polling_lock, adapter_queue.slot(float("-inf")):
+            self._connection_uses += 1
+            self._retry_budget = COMMAND_RETRY_BUDGET
+            if self._cancel_idle_disconnect is not None:
+                self._cancel_idle_disconnect()
+                self._cancel_idle_disconnect = None
+            self._cycle_budget = CycleBudget(
+                self.hass.loop.time(),
+                POLLING_BUDGET_SHARE * self.polling_timeout,
+                POLLING_LOW_PRIORITY_RESERVE,
+            )
+
+            try:
+                async with async_timeout.timeout(self.polling_timeout):
+                    await self._async_connect()
+
+                    self.logger.debug("Writing %s", commands)
+                    responses = await self.async_send_commands(commands)
+                    for command, response in zip(commands, responses):
+                        if not response:
+                            self.logger.warning("No confirmation for %s", command)
+                            failed.update(written_registers(command))
+
+                    await self._async_verify_writes(
+                        [write for write in writes if failed.isdisjoint(write.registers)]
+                    )
+
+            except TimeoutError:
+                self.logger.warning("Writing timed out for device %s", mac_loggable(self._address))
+            except BleakError as err:
+                self.logger.warning("Bleak error: %s", err)
+            finally:
+                self._cycle_budget = None
+                await self._async_release_connection()
+                for write in writes:
+                    if not write.future.done():
+                        write.future.set_result(False)
+
+    async def _async_verify_writes(self, writes: list[PendingWrite]) -> None:
+        """Read back the written registers until all writes show.
+
+        All registers are read with as few reads as possible, usually one.
+        """
+        field_reads: dict[str, ReadHoldingRegisters] = {}
+        register_reads: dict[int, ReadHoldingRegisters] = {}
+        for write in writes:
+            if write.fields:
+                for key in write.fields:
+                    command = self._verify_command(key)
+                    if command is not None:
+                        field_reads[key] = command
+            else:
+                for address in write.registers:
+                    register_reads[address] = ReadHoldingRegisters(address, 1)
+        reads = plan_reads(
+            [*field_reads.values(), *register_reads.values()],
+            self.bluetti_device.max_read_registers,
+            POLLING_MAX_REGISTER_GAP,
+        )
+
+        deadline = time.monotonic() + WRITE_VERIFY_TIMEOUT
+        while True:
+            parsed: dict[str, Any] = {}
+            raw: dict[int, int] = {}
+            responses = await self.async_send_commands([read.command for read in reads])
+            for read, body in zip(reads, responses):
+                if not body:
+                    continue
+                for address, part in read.split(body):
+                    raw.update(
+                        (address + i, value)
+                        for i, (value,) in enumerate(struct.iter_unpack("!H", part))
+                    )
+                    try:
+                        values = self.bluetti_device.parse(address, part)
+                    except ParseError:
+                        self.logger.warning("Got a parse exception...")
+                        continue
+                    parsed.update(values)
+                    self.field_states.update(
+                        {key: value for key, value in values.items() if key in field_reads},
+                        str(read.command),
+                        time.monotonic(),
+                    )
+
+            pending = []
+            for write in writes:
+                if all(
+                    key not in field_reads or parsed.get(key) == value
+                    for key, value in write.fields.items()
+                ) and all(
+                    address not in register_reads or raw.get(address) == value
+                    for address, value in write.registers.items()
+                ):
+                    write.future.set_result(True)
+                else:
+                    pending.append(write)
+            writes = pending
+            self._async_publish_values(field_reads.keys())
+
+            if len(writes) == 0:
+                return
+            if time.monotonic() >= deadline:
+                self.logger.warning(
+                    "Written values did not show in time: %s",
+                    [write.fields or write.registers for write in writes],
+                )
+                return
+            await asyncio.sleep(WRITE_VERIFY_INTERVAL)
+
+    def _verify_command(self, key: str) -> ReadHoldingRegisters | None:
+        """Get the read for checking a written field.
+
+        Prefers the read-only register of the field, as it shows the
+        actual state instead of the setting.
+        """
+        commands = self.register_map.get(key, [])
+        for command in commands:
+            if not any(
+                command.starting_address in writable
+                for writable in self.bluetti_device.writable_ranges
+            ):
+                return command
+        return commands[0] if commands else None
+
+    @callback
+    def _async_publish_values(self, keys: Iterable[str]) -> None:
+        """Notify the listeners of fields read before the end of a poll."""
+        self.data = self.field_states.values()
+        self._async_dispatch_key_updates(keys)
+
+    def metric_summary(self) -> dict[str, Any]:
+        """Get the command metrics and the state of the adapter queue."""
+        adapter_queue = self.adapter_scheduler.queue(self._address)
+        return {
+            **self.command_metrics.summary(),
+            "dropped_commands": self.dropped_commands,
+            **{
+                f"adapter_{key}": value
+                for key, value in adapter_queue.summary().items()
+            },
+        }
+
+    async def _async_release_connection(self) -> None:
+        """Keep the connection for the next poll or close it."""
+        idle_timeout = self.connection_policy.idle_timeout()
+        if idle_timeout is None:
+            self.connection_pool.acquire(self._address)
+            return
+        if (
+            idle_timeout > 0
+            and self.client.is_connected
+            and self.connection_pool.acquire(self._address)
+        ):
+            self.logger.debug("Keeping connection for %.0f seconds", idle_timeout)
+            self._cancel_idle_disconnect = async_call_later(
+                self.hass,
+                idle_timeout,
+                partial(self._async_idle_disconnect, self._connection_uses),
+            )
+            return
+        await self._async_disconnect()
+
+    async def _async_idle_disconnect(self, uses: int, _now: datetime) -> None:
+        """Close the connection if it was not used since the timer started."""
+        async with self.polling_lock:
+            if uses != self._connection_uses:
+                return
+            self._cancel_idle_disconnect = None
+            self.logger.debug("Closing idle connection")
+            await self._async_disconnect()
+
+    async def _async_disconnect(self) -> None:
+        """Close the connection."""
+        self.connection_pool.release(self._address)
+        if self.has_notifier:
+            try:
+                await self.client.stop_notify(BluetoothClient.NOTIFY_UUID)
+            except BleakError as err:
+                self.logger.debug("Could not stop notifications: %s", err)
+            self.has_notifier = False
+        await self.client.disconnect()
+
+    @property
+    def device_present(self) -> bool:
+        """Return if the device advertised or answered recently."""
+        return time.monotonic() - self._last_seen < ADVERTISEMENT_MAX_AGE
+
+    @callback
+    def async_track_advertisements(self) -> None:
+        """Follow advertisements of the device for presence and RSSI."""
+        self._cancel_advertisements = bluetooth.async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=self._address, connectable=False),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+
+    @callback
+    def _async_handle_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        _change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Handle an advertisement of the device."""
+        returned = not self.device_present
+        self._last_seen = self._last_advertisement = time.monotonic()
+        self.rssi = service_info.rssi
+        if self._next_advertisement is not None and not self._next_advertisement.done():
+            self._next_advertisement.set_result(None)
+        if returned:
+            # Device is in range now, poll right away
+            self.logger.debug("Device %s is back", mac_loggable(self._address))
+            self.circuit_breaker.retry_now()
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_wait_advertisement(self) -> None:
+        """Wait for the next advertisement, at most ADVERTISEMENT_WAIT seconds."""
+        self._next_advertisement = self.hass.loop.create_future()
+        try:
+            await asyncio.wait_for(self._next_advertisement, ADVERTISEMENT_WAIT)
+        except TimeoutError:
+            self.logger.debug(
+                "No advertisement from %s, connecting anyway", mac_loggable(self._address)
+            )
+        finally:
+            self._next_advertisement = None
+
+    async def async_shutdown(self) -> None:
+        """Close the connection on shutdown."""
+        await super().async_shutdown()
+        if self._cancel_advertisements is not None:
+            self._cancel_advertisements()
+            self._cancel_advertisements = None
+        if self._cancel_idle_disconnect is not None:
+            self._cancel_idle_disconnect()
+            self._cancel_idle_disconnect = None
+        self._end_stale()
+        await self._async_disconnect()
+
+    @callback
+    def async_add_field_demand(self, key: str) -> CALLBACK_TYPE:
+        """Poll the registers of a field until the returned callback is called."""
+        self._field_demand[key] = self._field_demand.get(key, 0) + 1
+        self._polling_plan_outdated = True
+
+        @callback
+        def remove_field_demand() -> None:
+            self._field_demand[key] -= 1
+            if self._field_demand[key] == 0:
+                del self._field_demand[key]
+            self._polling_plan_outdated = True
+
+        return remove_field_demand
+
+    @callback
+    def async_add_key_listener(
+        self, key: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of a single key in the data."""
+        if self._remove_key_dispatcher is None:
+            # Also keeps the refresh scheduled
+            self._remove_key_dispatcher = self.async_add_listener(
+                self._async_dispatch_key_updates
+            )
+        self._key_listeners.setdefault(key, []).append(update_callback)
+        self._published.pop(key, None)
+        self._published_available.pop(key, None)
+
+        @callback
+        def remove_key_listener() -> None:
+            self._key_listeners[key].remove(update_callback)
+            if len(self._key_listeners[key]) == 0:
+                del self._key_listeners[key]
+            if len(self._key_listeners) == 0 and self._remove_key_dispatcher is not None:
+                self._remove_key_dispatcher()
+                self._remove_key_dispatcher = None
+
+        return remove_key_listener
+
+    @callback
+    def _async_dispatch_key_updates(self, keys: Iterable[str] | None = None) -> None:
+        """Notify the listeners of keys which changed since the last update.
+
+        Only the given keys are checked, all if None.
+        """
+        notify_all = self.stale != self._published_stale
+        self._published_stale = self.stale
+
+        data = self.data if isinstance(self.data, dict) else {}
+        if keys is None:
+            keys = list(self._key_listeners)
+        for key in keys:
+            listeners = self._key_listeners.get(key)
+            if listeners is None:
+                continue
+            value = data.get(key)
+            available = self.field_available(key)
+            if available != self._published_available.get(key):
+                # Also notify if the field became too old
+                self._published_available[key] = available
+            elif (
+                not notify_all
+                and key in self._published
+                and not value_changed(
+                    self._published[key], value, FIELD_DEADBANDS.get(key, 0)
+                )
+            ):
+                continue
+            self._published[key] = value
+            for update_callback in list(listeners):
+                update_callback()
+
+    def field_available(self, key: str) -> bool:
+        """Return if a field was read recently enough to be shown."""
+        state = self.field_states.get(key)
+        if state is None:
+            return False
+        if self.stale:
+            return True
+        max_age = self.field_max_age(key)
+        return max_age is None or time.monotonic() - state.updated <= max_age
+
+    def field_max_age(self, key: str) -> float | None:
+        """Get the age after which a field is unavailable, None if never."""
+        if key in self.register_map:
+            interval = self.tier_scheduler.interval(field_tier(key))
+            if interval is None:
+                return None
+        else:
+            # Battery pack fields
+            interval = self.pack_cache.refresh_period
+        interval = max(interval, self.update_interval.total_seconds())
+        return FIELD_MAX_AGE_FACTOR * interval + self.polling_timeout
+
+    def _update_polling_plan(self):
+        """Build the reads needed for the currently used fields.
+
+        As long as no entity registered its field, everything is polled.
+        """
+        self._polling_plan_outdated = False
+        pack_range = range(1, self.bluetti_device.pack_num_max + 1)
+        if len(self.bluetti_device.pack_polling_commands) == 0:
+            pack_range = range(0)
+
+        polling_packs = self.polling_packs
+        if len(self._field_demand) == 0:
+            keys = self.register_map.keys()
+            self.polling_packs = list(pack_range)
+        else:
+            keys = set(self._field_demand)
+            self.polling_packs = [
+                pack
+                for pack in pack_range
+                if any(key + str(pack) in self._field_demand for key in self.pack_register_map)
+            ]
+            if len(self.polling_packs) > 0:
+                # The pack cache compares against the battery summary
+                keys.update(key for key in PACK_SUMMARY_FIELDS if key in self.register_map)
+        if self.polling_packs != polling_packs:
+            # Packs which were not polled for a while are read again
+            self.pack_cache.clear()
+
+        ranges: dict[PollingTier, dict] = {tier: {} for tier in PollingTier}
+        self._range_tiers = {}
+        for key in keys:
+            tier = field_tier(key)
+            for command in self.register_map.get(key, []):
+                register_range = (command.starting_address, command.quantity)
+                ranges[tier][register_range] = command
+                # Ranges can be shared by fields of several tiers
+                self._range_tiers.setdefault(register_range, set()).add(tier)
+        self.polling_ranges = {
+            tier: list(tier_ranges.values()) for tier, tier_ranges in ranges.items()
+        }
+        self._polling_plans = {}
+        self.logger.debug(
+            "Polling %s fields with %s ranges and %s packs",
+            len(self._field_demand) or "all",
+            {tier.value: len(tier_ranges) for tier, tier_ranges in ranges.items()},
+            len(self.polling_packs),
+        )
+
+        # Newly used fields might be in any tier
+        self._reset_tiers()
+
+    def _polling_plan(self, tiers: set[PollingTier]) -> list[CoalescedRead]:
+        """Get the reads for all ranges of the given tiers.
+
+        High priority reads come first, so they are done before the cycle
+        runs short of time.
+        """
+        key = frozenset(tiers)
+        if key not in self._polling_plans:
+            # Merge ranges into as few reads as possible
+            reads = plan_reads(
+                [command for tier in tiers for command in self.polling_ranges[tier]],
+                self.bluetti_device.max_read_registers,
+                POLLING_MAX_REGISTER_GAP,
+                self.bluetti_device.polling_commands,
+            )
+            self._polling_plans[key] = sorted(reads, key=self._read_priority, reverse=True)
+        return self._polling_plans[key]
+
+    def _read_tiers(self, read: CoalescedRead) -> set[PollingTier]:
+        """Get the tiers of the fields a read covers."""
+        return {
+            tier
+            for part in read.parts
+            for tier in self._range_tiers.get((part.starting_address, part.quantity), ())
+        }
+
+    def _read_priority(self, read: CoalescedRead) -> CommandPriority:
+        """Get the highest priority of the tiers of a read."""
+        return max(
+            (TIER_PRIORITIES[tier] for tier in self._read_tiers(read)),
+            default=CommandPriority.LOW,
+        )
+
+    def _reset_tiers(self):
+        """Poll all tiers in the next cycle."""
+        for tier in PollingTier:
+            self.tier_scheduler.reset(tier)
+
+    async def async_send_command(self, command: DeviceCommand) -> memoryview | bytes:
+        """Send command and return the response body"""
+        return (await self.async_send_commands([command]))[0]
+
+    async def async_send_commands(
+        self,
+        commands: List[DeviceCommand],
+        on_response: Callable[[int, memoryview | bytes], None] | None = None,
+        priorities: List[CommandPriority] | None = None,
+    ) -> List[memoryview | bytes]:
+        """Send commands and return their response bodies.
+
+        Commands which time out or get a broken response are sent again
+        after the others, as long as the retry budget lasts. If the
+        connection is lost, it is made again and sending resumes with the
+        failed command. Commands which still fail return empty bytes.
+
+        During a polling cycle, low priority commands which would not
+        finish in the time left are dropped and return empty bytes, too.
+        Commands without priorities are high priority.
+
+        on_response is called with the index and body of every command as
+        soon as its response is complete or it finally failed.
+        """
+        responses: List[memoryview | bytes] = [bytes()] * len(commands)
+        retries = [0] * len(commands)
+        todo = list(range(len(commands)))
+
+        while todo:
+            failed, connection_lost = await self._async_send_batch(
+                commands, todo, retries, responses, on_response, priorities
+            )
+            todo = []
+            for index, error in failed:
+                if error is None:
+                    # Not sent or answered before the connection was lost
+                    todo.append(index)
+                elif isinstance(error, ModbusError) or self._retry_budget <= 0:
+                    if on_response is not None:
+                        on_response(index, responses[index])
+                else:
+                    self._retry_budget -= 1
+                    retries[index] += 1
+                    todo.append(index)
+            todo.sort()
+
+            if todo and self._cycle_budget is not None and (
+                self._cycle_budget.remaining(self.hass.loop.time()) <= self._retry_delay()
+            ):
+                self.logger.debug("No time left to send %s commands again", len(todo))
+                if on_response is not None:
+                    for index in todo:
+                        on_response(index, responses[index])
+                break
+
+            if todo and connection_lost:
+                self.logger.debug("Reconnecting to resume with %s", commands[todo[0]])
+                await self._async_disconnect()
+                await self._async_connect()
+            elif todo:
+                await asyncio.sleep(self._retry_delay())
+
+        return responses
+
+    async def _async_send_batch(
+        self,
+        commands: List[DeviceCommand],
+        indices: List[int],
+        retries: List[int],
+        responses: List[memoryview | bytes],
+        on_response: Callable[[int, memoryview | bytes], None] | None,
+        priorities: List[CommandPriority] | None,
+    ) -> tuple[List[tuple[int, Exception | None]], bool]:
+        """Send the commands at the given indices once, one at a time.
+
+        Returns the indices of the failed commands with their error, None
+        for commands dropped because the connection was lost, and whether
+        it was lost.
+        """
+        failed: List[tuple[int, Exception | None]] = []
+        for position, index in enumerate(indices):
+            command = commands[index]
+            priority = priorities[index] if priorities is not None else CommandPriority.HIGH
+            if self._cycle_budget is not None and not self._cycle_budget.allows(
+                priority, self._expected_duration(command), self.hass.loop.time()
+            ):
+                self.logger.debug("Not enough time left for %s", command)
+                self._cycle_budget.drop(command)
+                if on_response is not None:
+                    on_response(index, responses[index])
+                continue
+
+            request = self.request_queue.add(
+                command, self.hass.loop, self._command_timeout(command)
+            )
+            request.retries = retries[index]
 
             # Make request
             self.logger.debug("Requesting %s", command)
-            await self.client.write_gatt_char(
-                BluetoothClient.WRITE_UUID, bytes(command)
-            )
+            try:
+                await self.client.write_gatt_char(
+                    BluetoothClient.WRITE_UUID, bytes(command)
+                )
+            except BleakError as err:
+                self.request_queue.remove(request)
+                request.future.set_exception(err)
+
+            body, error = await self._async_wait_response(request)
+            if error is None:
+                responses[index] = body
+                if on_response is not None:
+                    on_response(index, body)
+                continue
+            failed.append((index, error))
+            if isinstance(error, (BadConnectionError, BleakError)):
+                # Resume with the commands after the failed one
+                failed.extend((later, None) for later in indices[position + 1 :])
+                return failed, True
+
+        return failed, False
+
+    def _expected_duration(self, command: DeviceCommand) -> float:
+        """Get how long a command usually takes, in seconds."""
+        duration = self.command_metrics.duration(str(command), 95)
+        return duration if duration is not None else BluetoothClient.RESPONSE_TIMEOUT
+
+    def _command_timeout(self, command: DeviceCommand) -> float:
+        """Get how long to wait for the response to a command.
+
+        A multiple of its usual duration, but not longer than the time
+        left in the polling cycle.
+        """
+        timeout = min(
+            max(COMMAND_TIMEOUT_FACTOR * self._expected_duration(command), COMMAND_MIN_TIMEOUT),
+            BluetoothClient.RESPONSE_TIMEOUT,
+        )
+        if self._cycle_budget is not None:
+            timeout = min(timeout, self._cycle_budget.remaining(self.hass.loop.time()))
+        return timeout
 
-            # Wait for response
+    def _retry_delay(self) -> float:
+        """Get the delay before sending failed commands again.
+
+        About as long as the device takes to answer, so late fragments of
+        failed responses arrive before the commands are sent again.
+        """
+        latency = self.command_metrics.summary().get("latency_p50")
+        if latency is None:
+            return COMMAND_RETRY_MAX_DELAY
+        return min(latency / 1000, COMMAND_RETRY_MAX_DELAY)
+
+    async def _async_wait_response(
+        self, request: PendingRequest
+    ) -> tuple[memoryview | bytes, Exception | None]:
+        """Wait for the response to a request.
+
+        Returns the response body and the error, if the request failed.
+        """
+        command = request.buffer.command
+        error: Exception | None = None
+        try:
             res = await asyncio.wait_for(
-                self.notify_future, timeout=BluetoothClient.RESPONSE_TIMEOUT
+                request.future, timeout=max(request.deadline - self.hass.loop.time(), 0)
             )
 
             # Process data
-            self.logger.debug("Got %s bytes", len(res))
-            return cast(bytes, res)
+            self.logger.debug("Got %s bytes", request.buffer.size)
+            return res, None
 
-        except TimeoutError:
+        except TimeoutError as err:
+            error = err
             self.logger.debug(
-                "Polling timed out (address: %s)", mac_loggable(self._address)
+                "No response to %s (address: %s)", command, mac_loggable(self._address)
             )
         except ModbusError as err:
+            error = err
             self.logger.warning(
                 "Got an invalid request error for %s: %s",
                 command,
                 err,
             )
+        except ParseError as err:
+            error = err
+            self.logger.debug("Got a broken response to %s: %s", command, err)
         except (BadConnectionError, BleakError) as err:
+            error = err
             self.logger.warning(
                 "Needed to disconnect due to error: %s (This can also be the case if you used device controls)", err
             )
+        finally:
+            if isinstance(error, TimeoutError):
+                # Discard the response if it still arrives
+                self.request_queue.expire(request)
+            else:
+                self.request_queue.remove(request)
+            self._record_command(request, error)
+
+        return bytes(), error
 
-        # caught an exception, return empty bytes object
-        return bytes()
+    def _record_command(self, request: PendingRequest, error: Exception | None) -> None:
+        """Add the timing of a finished request to the metrics."""
+        finished = request.finished or time.monotonic()
+        self.command_metrics.record(
+            CommandSample(
+                str(request.buffer.command),
+                (
+                    request.first_fragment - request.sent
+                    if request.first_fragment is not None
+                    else None
+                ),
+                finished - request.sent,
+                request.fragments,
+                request.buffer.size,
+                request.retries,
+                type(error).__name__ if error is not None else None,
+            )
+        )
 
     def _notification_handler(self, _sender: int, data: bytearray):
         """Handle bt data."""
 
-        # Ignore notifications we don't expect
-        if not self.notify_future or self.notify_future.done():
-            _LOGGER.warning("Unexpected notification")
+        # Late responses to requests which timed out are expected
+        if len(self.request_queue) == 0:
+            _LOGGER.debug("Discarded notification, no request pending")
             return
 
         # If something went wrong, we might get weird data.
         if data == b"AT+NAME?\r" or data == b"AT+ADV?\r":
-            err = BadConnectionError("Got AT+ notification")
-            self.notify_future.set_exception(err)
+            self.request_queue.fail(BadConnectionError("Got AT+ notification"))
             return
 
-        # Save data
-        self.notify_response.extend(data)
-
-        if len(self.notify_response) == self.current_command.response_size():
-            if self.current_command.is_valid_response(self.notify_response):
-                self.notify_future.set_result(self.notify_response)
-            else:
-                self.notify_future.set_exception(ParseError("Failed checksum"))
-        elif self.current_command.is_exception_response(self.notify_response):
-            # We got a MODBUS command exception
-            msg = f"MODBUS Exception {self.current_command}: {self.notify_response[2]}"
-            self.notify_future.set_exception(ModbusError(msg))
+        if not self.request_queue.feed(data):
+            _LOGGER.debug("Discarded notification data not matching a request")
@@ -0,0 +1,64 @@
+"""Diagnostics support for Bluetti BT."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_COORDINATOR, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import PollingCoordinator
+
+TO_REDACT = {CONF_ADDRESS, CONF_NAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+    }
+
+    coordinator: PollingCoordinator | None = hass.data[DOMAIN][entry.entry_id].get(
+        DATA_COORDINATOR
+    )
+    if coordinator is None:
+        return diagnostics
+
+    diagnostics["device_type"] = coordinator.bluetti_device.type
+    diagnostics["polling"] = {
+        "last_update_success": coordinator.last_update_success,
+        "device_present": coordinator.device_present,
+        "rssi": coordinator.rssi,
+        "ranges": {
+            tier.value: [
+                [command.starting_address, command.quantity] for command in commands
+            ]
+            for tier, commands in coordinator.polling_ranges.items()
+        },
+        "packs": coordinator.polling_packs,
+    }
+    diagnostics["fields"] = {
+        "version": coordinator.field_states.version,
+        "stale": coordinator.stale,
+        "ages": {
+            key: {"age": round(age, 1), "source": source}
+            for key, (age, source) in coordinator.field_states.ages(
+                time.monotonic()
+            ).items()
+        },
+    }
+    diagnostics["commands"] = coordinator.command_metrics.as_dict()
+    diagnostics["adapters"] = {
+        adapter: adapter_queue.summary()
+        for adapter, adapter_queue in coordinator.adapter_scheduler.queues.items()
+    }
+    return diagnostics
@@ -0,0 +1,69 @@
+"""Base entity for Bluetti BT."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from .const import ATTR_STALE
+
+if TYPE_CHECKING:
+    from .coordinator import PollingCoordinator
+
+
+class BluettiEntity(Entity):
+    """Bluetti entity backed by a polled field.
+
+    Works like a CoordinatorEntity, but only listens for changes of
+    its own field instead of every coordinator update.
+    """
+
+    _attr_should_poll = False
+    _response_key: str
+
+    def __init__(self, coordinator: PollingCoordinator) -> None:
+        """Init entity."""
+        self.coordinator = coordinator
+
+    @property
+    def available(self) -> bool:
+        """Return if the field was read recently enough."""
+        return self.coordinator.field_available(self._response_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark values restored from the last run until the device is polled."""
+        if self.coordinator.stale:
+            return {ATTR_STALE: True}
+        return None
+
+    async def async_added_to_hass(self) -> None:
+        """Request polling of the field while the entity is in use."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_field_demand(self._response_key)
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_key_listener(
+                self._response_key, self._handle_coordinator_update
+            )
+        )
+        if isinstance(self.coordinator.data, dict):
+            # Show the current or restored value right away
+            self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
+
+    async def async_update(self) -> None:
+        """Update the entity.
+
+        Only used by the generic entity update service.
+        """
+        if not self.enabled:
+            return
+        await self.coordinator.async_request_refresh()
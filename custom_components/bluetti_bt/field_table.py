@@ -0,0 +1,345 @@
+"""Field table by device type.
+
+Generated by scripts/generate_field_table.py from bluetti_mqtt 0.15.0.
+Do not edit.
+"""
+
+from .fields import FieldConfig, FieldType
+
+FIELDS: dict[str, FieldConfig] = {
+    "dc_input_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "DC Input Power", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_input_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Input Power", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_output_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Power", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "dc_output_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "DC Output Power", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "power_generation": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Total Power Generation", "unit_of_measurement": "kWh", "device_class": "energy", "state_class": "total_increasing"}),
+    "total_battery_percent": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Total Battery Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}),
+    "ac_output_on": FieldConfig(FieldType.BOOL, True, False, {"name": "AC Output", "device_class": "outlet"}),
+    "dc_output_on": FieldConfig(FieldType.BOOL, True, False, {"name": "DC Output", "device_class": "outlet"}),
+    "ac_output_mode": FieldConfig(FieldType.ENUM, False, True, {"name": "AC Output Mode"}),
+    "internal_ac_voltage": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal AC Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "internal_current_one": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Current Sensor 1", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "internal_power_one": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Power Sensor 1", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "internal_ac_frequency": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal AC Frequency", "unit_of_measurement": "Hz", "device_class": "frequency", "state_class": "measurement"}),
+    "total_battery_voltage": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Total Battery Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "power_off": FieldConfig(FieldType.BUTTON, True, False, {"name": "Power Off"}),
+    "auto_sleep_mode": FieldConfig(FieldType.ENUM, True, False, {"name": "Screen Auto Sleep Mode", "options": ["THIRTY_SECONDS", "ONE_MINUTE", "FIVE_MINUTES", "NEVER"]}),
+    "pack_status1": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 1 Status"}, id_override="pack_status1"),
+    "pack_voltage1": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 1 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage1"),
+    "pack_battery_percent1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 1 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent1"),
+    "pack_status2": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 2 Status"}, id_override="pack_status2"),
+    "pack_voltage2": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 2 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage2"),
+    "pack_battery_percent2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 2 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent2"),
+    "pack_status3": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 3 Status"}, id_override="pack_status3"),
+    "pack_voltage3": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 3 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage3"),
+    "pack_battery_percent3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 3 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent3"),
+    "internal_current_two": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Current Sensor 2", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "internal_power_two": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Power Sensor 2", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_input_voltage": FieldConfig(FieldType.NUMERIC, False, True, {"name": "AC Input Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "internal_current_three": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Current Sensor 3", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "internal_power_three": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Internal Power Sensor 3", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_input_frequency": FieldConfig(FieldType.NUMERIC, False, True, {"name": "AC Input Frequency", "unit_of_measurement": "Hz", "device_class": "frequency", "state_class": "measurement"}),
+    "total_battery_current": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Total Battery Current", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "ups_mode": FieldConfig(FieldType.ENUM, True, False, {"name": "UPS Working Mode", "options": ["CUSTOMIZED", "PV_PRIORITY", "STANDARD", "TIME_CONTROL"]}),
+    "split_phase_on": FieldConfig(FieldType.BOOL, False, False, {"name": "Split Phase"}),
+    "split_phase_machine_mode": FieldConfig(FieldType.ENUM, False, False, {"name": "Split Phase Machine"}),
+    "grid_charge_on": FieldConfig(FieldType.BOOL, True, False, {"name": "Grid Charge"}),
+    "time_control_on": FieldConfig(FieldType.BOOL, True, False, {"name": "Time Control"}),
+    "battery_range_start": FieldConfig(FieldType.NUMERIC, True, False, {"name": "Battery Range Start", "unit_of_measurement": "%"}),
+    "battery_range_end": FieldConfig(FieldType.NUMERIC, True, False, {"name": "Battery Range End", "unit_of_measurement": "%"}),
+    "pack_status4": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 4 Status"}, id_override="pack_status4"),
+    "pack_voltage4": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 4 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage4"),
+    "pack_battery_percent4": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 4 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent4"),
+    "pack_status5": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 5 Status"}, id_override="pack_status5"),
+    "pack_voltage5": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 5 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage5"),
+    "pack_battery_percent5": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 5 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent5"),
+    "pack_status6": FieldConfig(FieldType.ENUM, False, True, {"name": "Battery Pack 6 Status"}, id_override="pack_status6"),
+    "pack_voltage6": FieldConfig(FieldType.NUMERIC, False, True, {"name": "Battery Pack 6 Voltage", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}, id_override="pack_voltage6"),
+    "pack_battery_percent6": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Battery Pack 6 Percent", "unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}, id_override="pack_percent6"),
+    "bcu_version": FieldConfig(FieldType.NUMERIC, False, False, {"name": "BCU Version"}),
+    "max_ac_input_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Max AC Input Power per Phase"}),
+    "max_ac_input_current": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Max AC Input Current per Phase"}),
+    "max_ac_output_power": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Max AC Output Power per Phase"}),
+    "max_ac_output_current": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Max AC Output Current per Phase"}),
+    "safety_module_version": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Safety Module Version"}),
+    "high_voltage_module_version": FieldConfig(FieldType.NUMERIC, False, False, {"name": "High Voltage Safety Module Version"}),
+    "pv_input_power1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Solar Input Power 1", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "pv_input_power2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Solar Input Power 2", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "adl400_ac_input_power_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Power Phase 1", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "adl400_ac_input_power_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Power Phase 2", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "adl400_ac_input_power_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Power Phase 3", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "adl400_ac_input_voltage_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Voltage Phase 1", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "adl400_ac_input_voltage_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Voltage Phase 2", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "adl400_ac_input_voltage_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "ADL400 AC Input Voltage Phase 3", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "grid_input_power_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Power Phase 1", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "grid_input_power_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Power Phase 2", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "grid_input_power_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Power Phase 3", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "grid_input_voltage_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Voltage Phase 1", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "grid_input_voltage_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Voltage Phase 2", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "grid_input_voltage_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Voltage Phase 3", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "grid_input_current_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Current Phase 1", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "grid_input_current_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Current Phase 2", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "grid_input_current_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "Grid Input Current Phase 3", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "ac_output_frequency": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Frequency", "unit_of_measurement": "Hz", "device_class": "frequency", "state_class": "measurement"}),
+    "ac_output_power_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Power Phase 1", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_output_power_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Power Phase 2", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_output_power_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Power Phase 3", "unit_of_measurement": "W", "device_class": "power", "state_class": "measurement"}),
+    "ac_output_voltage_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Voltage Phase 1", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "ac_output_voltage_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Voltage Phase 2", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "ac_output_voltage_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Voltage Phase 3", "unit_of_measurement": "V", "device_class": "voltage", "state_class": "measurement"}),
+    "ac_output_current_phase1": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Current Phase 1", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "ac_output_current_phase2": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Current Phase 2", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "ac_output_current_phase3": FieldConfig(FieldType.NUMERIC, False, False, {"name": "AC Output Current Phase 3", "unit_of_measurement": "A", "device_class": "current", "state_class": "measurement"}),
+    "led_mode": FieldConfig(FieldType.ENUM, True, False, {"name": "LED Mode", "options": ["LOW", "HIGH", "SOS", "OFF"]}),
+    "eco_on": FieldConfig(FieldType.BOOL, True, False, {"name": "ECO"}),
+    "eco_shutdown": FieldConfig(FieldType.ENUM, True, False, {"name": "ECO Shutdown", "options": ["ONE_HOUR", "TWO_HOURS", "THREE_HOURS", "FOUR_HOURS"]}),
+    "charging_mode": FieldConfig(FieldType.ENUM, True, False, {"name": "Charging Mode", "options": ["STANDARD", "SILENT", "TURBO"]}),
+    "power_lifting_on": FieldConfig(FieldType.BOOL, True, False, {"name": "Power Lifting"}),
+}
+
+DEVICE_FIELDS: dict[str, tuple[str, ...]] = {
+    "AC200M": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "power_generation",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_output_mode",
+        "internal_ac_voltage",
+        "internal_current_one",
+        "internal_power_one",
+        "internal_ac_frequency",
+        "total_battery_voltage",
+        "power_off",
+        "auto_sleep_mode",
+        "pack_status1",
+        "pack_voltage1",
+        "pack_battery_percent1",
+        "pack_status2",
+        "pack_voltage2",
+        "pack_battery_percent2",
+        "pack_status3",
+        "pack_voltage3",
+        "pack_battery_percent3",
+    ),
+    "AC300": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "power_generation",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_output_mode",
+        "internal_ac_voltage",
+        "internal_current_one",
+        "internal_power_one",
+        "internal_ac_frequency",
+        "internal_current_two",
+        "internal_power_two",
+        "ac_input_voltage",
+        "internal_current_three",
+        "internal_power_three",
+        "ac_input_frequency",
+        "total_battery_voltage",
+        "total_battery_current",
+        "ups_mode",
+        "split_phase_on",
+        "split_phase_machine_mode",
+        "grid_charge_on",
+        "time_control_on",
+        "battery_range_start",
+        "battery_range_end",
+        "auto_sleep_mode",
+        "pack_status1",
+        "pack_voltage1",
+        "pack_battery_percent1",
+        "pack_status2",
+        "pack_voltage2",
+        "pack_battery_percent2",
+        "pack_status3",
+        "pack_voltage3",
+        "pack_battery_percent3",
+        "pack_status4",
+        "pack_voltage4",
+        "pack_battery_percent4",
+    ),
+    "AC500": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "power_generation",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_output_mode",
+        "internal_ac_voltage",
+        "internal_current_one",
+        "internal_power_one",
+        "internal_ac_frequency",
+        "internal_current_two",
+        "internal_power_two",
+        "ac_input_voltage",
+        "internal_current_three",
+        "internal_power_three",
+        "ac_input_frequency",
+        "total_battery_voltage",
+        "ups_mode",
+        "split_phase_on",
+        "split_phase_machine_mode",
+        "grid_charge_on",
+        "time_control_on",
+        "battery_range_start",
+        "battery_range_end",
+        "auto_sleep_mode",
+        "pack_status1",
+        "pack_voltage1",
+        "pack_battery_percent1",
+        "pack_status2",
+        "pack_voltage2",
+        "pack_battery_percent2",
+        "pack_status3",
+        "pack_voltage3",
+        "pack_battery_percent3",
+        "pack_status4",
+        "pack_voltage4",
+        "pack_battery_percent4",
+        "pack_status5",
+        "pack_voltage5",
+        "pack_battery_percent5",
+        "pack_status6",
+        "pack_voltage6",
+        "pack_battery_percent6",
+    ),
+    "AC60": (
+        "total_battery_percent",
+        "power_generation",
+        "bcu_version",
+    ),
+    "EP500P": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "power_generation",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_output_mode",
+        "internal_ac_voltage",
+        "internal_current_one",
+        "internal_power_one",
+        "internal_ac_frequency",
+        "internal_current_two",
+        "internal_power_two",
+        "ac_input_voltage",
+        "internal_current_three",
+        "internal_power_three",
+        "ac_input_frequency",
+        "total_battery_voltage",
+        "ups_mode",
+        "split_phase_on",
+        "split_phase_machine_mode",
+        "grid_charge_on",
+        "time_control_on",
+        "battery_range_start",
+        "battery_range_end",
+        "auto_sleep_mode",
+        "pack_status1",
+        "pack_voltage1",
+        "pack_battery_percent1",
+    ),
+    "EP500": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "power_generation",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_output_mode",
+        "internal_ac_voltage",
+        "internal_current_one",
+        "internal_power_one",
+        "internal_ac_frequency",
+        "internal_current_two",
+        "internal_power_two",
+        "ac_input_voltage",
+        "internal_current_three",
+        "internal_power_three",
+        "ac_input_frequency",
+        "total_battery_voltage",
+        "ups_mode",
+        "split_phase_on",
+        "split_phase_machine_mode",
+        "grid_charge_on",
+        "time_control_on",
+        "battery_range_start",
+        "battery_range_end",
+        "auto_sleep_mode",
+        "pack_status1",
+        "pack_voltage1",
+        "pack_battery_percent1",
+    ),
+    "EP600": (
+        "total_battery_percent",
+        "power_generation",
+        "battery_range_start",
+        "battery_range_end",
+        "max_ac_input_power",
+        "max_ac_input_current",
+        "max_ac_output_power",
+        "max_ac_output_current",
+        "bcu_version",
+        "safety_module_version",
+        "high_voltage_module_version",
+        "pv_input_power1",
+        "pv_input_power2",
+        "adl400_ac_input_power_phase1",
+        "adl400_ac_input_power_phase2",
+        "adl400_ac_input_power_phase3",
+        "adl400_ac_input_voltage_phase1",
+        "adl400_ac_input_voltage_phase2",
+        "adl400_ac_input_voltage_phase3",
+        "grid_input_power_phase1",
+        "grid_input_power_phase2",
+        "grid_input_power_phase3",
+        "grid_input_voltage_phase1",
+        "grid_input_voltage_phase2",
+        "grid_input_voltage_phase3",
+        "grid_input_current_phase1",
+        "grid_input_current_phase2",
+        "grid_input_current_phase3",
+        "ac_output_frequency",
+        "ac_output_power_phase1",
+        "ac_output_power_phase2",
+        "ac_output_power_phase3",
+        "ac_output_voltage_phase1",
+        "ac_output_voltage_phase2",
+        "ac_output_voltage_phase3",
+        "ac_output_current_phase1",
+        "ac_output_current_phase2",
+        "ac_output_current_phase3",
+    ),
+    "EB3A": (
+        "dc_input_power",
+        "ac_input_power",
+        "ac_output_power",
+        "dc_output_power",
+        "total_battery_percent",
+        "ac_output_on",
+        "dc_output_on",
+        "ac_input_voltage",
+        "led_mode",
+        "power_off",
+        "eco_on",
+        "eco_shutdown",
+        "charging_mode",
+        "power_lifting_on",
+    ),
+}
@@ -0,0 +1,31 @@
+"""Field metadata for Bluetti devices.
+
+Same layout as the field configs of bluetti_mqtt.mqtt_client, which is not
+imported here as it loads the whole MQTT stack.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum, auto, unique
+
+
+@unique
+class FieldType(Enum):
+    """Type of a device field."""
+
+    NUMERIC = auto()
+    BOOL = auto()
+    ENUM = auto()
+    BUTTON = auto()
+
+
+@dataclass(frozen=True)
+class FieldConfig:
+    """Home Assistant config of a device field."""
+
+    type: FieldType
+    setter: bool
+    advanced: bool
+    home_assistant_extra: dict
+    id_override: str | None = None
@@ -0,0 +1,110 @@
+"""Command latency metrics."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+import math
+from typing import Any
+
+
+@dataclass
+class CommandSample:
+    """Timing of a single command."""
+
+    command: str
+    latency: float | None  # Seconds from write to first fragment
+    duration: float  # Seconds from write to complete response or failure
+    fragments: int
+    size: int  # Received bytes
+    retries: int
+    error: str | None  # Exception class name
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Get the nearest rank percentile of sorted values."""
+    if len(values) == 0:
+        return None
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def _summarize(samples: deque[CommandSample]) -> dict[str, Any]:
+    """Summarize samples, times in milliseconds."""
+    latencies = sorted(s.latency for s in samples if s.latency is not None)
+    durations = sorted(s.duration for s in samples if s.error is None)
+    errors = Counter(s.error for s in samples if s.error is not None)
+    busy = sum(durations)
+
+    summary: dict[str, Any] = {
+        "count": len(samples),
+        "errors": dict(errors),
+        "error_rate": 100 * sum(errors.values()) / len(samples) if samples else None,
+        "retries": sum(s.retries for s in samples),
+        "fragments_mean": (
+            sum(s.fragments for s in samples) / len(samples) if samples else None
+        ),
+        "bytes_per_second": (
+            sum(s.size for s in samples if s.error is None) / busy if busy > 0 else None
+        ),
+    }
+    for name, values in (("latency", latencies), ("duration", durations)):
+        for percent in (50, 95, 99):
+            value = percentile(values, percent)
+            summary[f"{name}_p{percent}"] = (
+                round(value * 1000, 1) if value is not None else None
+            )
+    return summary
+
+
+class CommandMetrics:
+    """Keeps the latest command samples in fixed size ring buffers.
+
+    There is one buffer for all commands and one per command, so slow
+    register ranges can be told apart.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Init metrics."""
+        self._size = size
+        self.samples: deque[CommandSample] = deque(maxlen=size)
+        self._by_command: dict[str, deque[CommandSample]] = {}
+        self._summary: dict[str, Any] | None = None
+
+    def record(self, sample: CommandSample) -> None:
+        """Add a sample."""
+        self.samples.append(sample)
+        if sample.command not in self._by_command:
+            self._by_command[sample.command] = deque(maxlen=self._size)
+        self._by_command[sample.command].append(sample)
+        self._summary = None
+
+    def duration(self, command: str, percent: float) -> float | None:
+        """Get a percentile of the successful durations of a command.
+
+        Falls back to all commands if the command did not succeed yet.
+        Returns seconds, None if there are no samples at all.
+        """
+        durations = sorted(
+            s.duration for s in self._by_command.get(command, ()) if s.error is None
+        )
+        if len(durations) == 0:
+            durations = sorted(s.duration for s in self.samples if s.error is None)
+        return percentile(durations, percent)
+
+    def summary(self) -> dict[str, Any]:
+        """Get the summary of all commands."""
+        if self._summary is None:
+            self._summary = _summarize(self.samples)
+        return self._summary
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get all metrics for diagnostics."""
+        return {
+            "summary": self.summary(),
+            "commands": {
+                command: _summarize(samples)
+                for command, samples in self._by_command.items()
+            },
+            "recent": [asdict(sample) for sample in list(self.samples)[-20:]],
+        }
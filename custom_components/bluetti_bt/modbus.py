@@ -0,0 +1,364 @@
+"""MODBUS response handling for Bluetti devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from bluetti_mqtt.bluetooth import ModbusError, ParseError
+from bluetti_mqtt.core.commands import DeviceCommand, ReadHoldingRegisters
+from bluetti_mqtt.core.utils import modbus_crc
+
+_LOGGER = logging.getLogger(__name__)
+
+# Initial value of CRC-16/MODBUS
+MODBUS_CRC_INIT = 0xFFFF
+# MODBUS address used by Bluetti devices
+MODBUS_DEVICE_ADDRESS = 1
+# Address, function code, exception code and CRC
+MODBUS_EXCEPTION_SIZE = 5
+# Address, function code and byte count or start of the register address,
+# enough to tell which request a frame answers
+MODBUS_HEADER_SIZE = 3
+
+
+class ResponseBuffer:
+    """Reassembles the response to a command from BLE notifications.
+
+    The buffer is allocated once with the expected response size and
+    fragments are written into it without intermediate copies. The
+    checksum is updated with every fragment, so validating a complete
+    response only compares the last two bytes.
+    """
+
+    def __init__(self, command: DeviceCommand) -> None:
+        """Init buffer for a command."""
+        self.command = command
+        self.expected_size = command.response_size()
+        self.size = 0
+        self._exception_code = command.function_code + 0x80
+        # Write responses repeat the register address of the request
+        self._echo = (
+            None if isinstance(command, ReadHoldingRegisters) else bytes(command)[2:4]
+        )
+        self._buffer = bytearray(self.expected_size)
+        self._view = memoryview(self._buffer)
+        self._crc = MODBUS_CRC_INIT
+        self._crc_end = self.expected_size - 2
+
+    @property
+    def response(self) -> memoryview:
+        """The received part of the response."""
+        return self._view[: self.size]
+
+    def add(self, data: bytes) -> bool:
+        """Add a fragment and return True if the response is complete."""
+        end = self.size + len(data)
+        if end > self.expected_size:
+            raise ParseError(
+                f"Response to {self.command} too long ({end} > {self.expected_size} bytes)"
+            )
+        self._view[self.size : end] = data
+        # modbus_crc is table driven and continues from the given value,
+        # slicing the fragment is only needed for the one with the checksum
+        if end <= self._crc_end:
+            self._crc = modbus_crc(data, self._crc)
+        elif self.size < self._crc_end:
+            self._crc = modbus_crc(data[: self._crc_end - self.size], self._crc)
+        self.size = end
+        return end == self.expected_size
+
+    def reset(self) -> None:
+        """Drop the received data."""
+        self.size = 0
+        self._crc = MODBUS_CRC_INIT
+
+    def header(self) -> bytes:
+        """Get the header of a response to the command."""
+        if self._echo is None:
+            return bytes(
+                [MODBUS_DEVICE_ADDRESS, self.command.function_code, self.expected_size - 5]
+            )
+        return bytes([MODBUS_DEVICE_ADDRESS, self.command.function_code]) + self._echo
+
+    def matches(self, data: memoryview) -> bool:
+        """Check if data starts with the header of a response to the command.
+
+        Responses are matched by device address, function code and the
+        byte count for register reads or the register address for writes.
+        Data has to contain at least MODBUS_HEADER_SIZE bytes.
+        """
+        if data[0] != MODBUS_DEVICE_ADDRESS:
+            return False
+        if data[1] == self._exception_code:
+            return True
+        if data[1] != self.command.function_code:
+            return False
+        if self._echo is None:
+            return data[2] == self.expected_size - 5
+        return data[2] == self._echo[0] and (len(data) < 4 or data[3] == self._echo[1])
+
+    def missing(self, data: memoryview) -> int:
+        """Get how many bytes of data belong to this response."""
+        if self.size == 0 and len(data) >= 2 and data[1] == self._exception_code:
+            return MODBUS_EXCEPTION_SIZE
+        if self.is_exception():
+            return MODBUS_EXCEPTION_SIZE - self.size
+        return self.expected_size - self.size
+
+    def is_exception(self) -> bool:
+        """Check if the response is a MODBUS exception."""
+        return self.size >= 2 and self._buffer[1] == self._exception_code
+
+    def is_complete(self) -> bool:
+        """Check if the whole response or exception was received."""
+        if self.is_exception():
+            return self.size >= MODBUS_EXCEPTION_SIZE
+        return self.size == self.expected_size
+
+    def is_valid(self) -> bool:
+        """Validate the checksum of the complete response or exception."""
+        if self.is_exception():
+            crc = modbus_crc(self._view[: MODBUS_EXCEPTION_SIZE - 2])
+            return crc == self._buffer[3] | self._buffer[4] << 8
+        return self._crc == self._buffer[-2] | self._buffer[-1] << 8
+
+    def body(self) -> memoryview | bytes:
+        """Get the response body without header and checksum.
+
+        For register reads this is a view into the buffer, so it is only
+        valid as long as the buffer is not reused.
+        """
+        if isinstance(self.command, ReadHoldingRegisters):
+            return self._view[3:-2]
+        return self.command.parse_response(self._view)
+
+
+@dataclass
+class PendingRequest:
+    """A command waiting for its response."""
+
+    buffer: ResponseBuffer
+    future: asyncio.Future
+    deadline: float  # Event loop time
+    sent: float = 0.0  # Monotonic time of the request
+    first_fragment: float | None = None  # Monotonic time
+    finished: float | None = None  # Monotonic time
+    fragments: int = 0
+    retries: int = 0
+    expired: float | None = None  # Monotonic time it timed out
+
+
+@dataclass
+class PendingWrite:
+    """Register writes waiting to be sent."""
+
+    registers: dict[int, int]
+    fields: dict[str, Any]  # Expected field values, checked instead of registers
+    future: asyncio.Future  # Result is True if the writes were verified
+
+
+class RequestQueue:
+    """Matches response frames in the notification data to pending requests.
+
+    Notifications are a byte stream, a single one can finish one response
+    and start the next one. A frame starts with a header matching one of
+    the pending requests and ends after the expected response length.
+    Anything else, like the rest of a response which arrived after its
+    request timed out, is discarded until the next valid header. If a
+    frame fails its checksum because it ran into the next one, the data
+    is searched again for a header, so a lost fragment only breaks one
+    response. Exceptions need a valid checksum as well, as register data
+    can look like an exception header.
+
+    Responses are expected in the order of the requests, a valid frame
+    fails the requests before it. Requests which
+    timed out stay in the queue for late_timeout seconds, so their late
+    responses are discarded instead of being taken for the response to a
+    later request. A request replaces the timed out ones with the same
+    header, their responses can not be told apart.
+    """
+
+    def __init__(self, late_timeout: float) -> None:
+        """Init queue."""
+        self.late_timeout = late_timeout
+        self._pending: deque[PendingRequest] = deque()
+        self._current: PendingRequest | None = None  # Frame being received
+        self._partial_header = b""  # Start of a header split across notifications
+
+    def __len__(self) -> int:
+        """Number of requests waiting for a response, late ones included."""
+        return len(self._pending)
+
+    def add(
+        self, command: DeviceCommand, loop: asyncio.AbstractEventLoop, timeout: float
+    ) -> PendingRequest:
+        """Add a request before writing its command."""
+        request = PendingRequest(
+            ResponseBuffer(command),
+            loop.create_future(),
+            loop.time() + timeout,
+            time.monotonic(),
+        )
+        header = request.buffer.header()
+        for expired in [r for r in self._pending if r.expired and r.buffer.matches(header)]:
+            self.remove(expired)
+        self._pending.append(request)
+        return request
+
+    def remove(self, request: PendingRequest) -> None:
+        """Stop waiting for a response.
+
+        The rest of its frame is discarded when it arrives.
+        """
+        if request in self._pending:
+            self._pending.remove(request)
+        if request is self._current:
+            self._current = None
+
+    def expire(self, request: PendingRequest) -> None:
+        """Mark a request as timed out, its response might still arrive."""
+        if request in self._pending:
+            request.expired = time.monotonic()
+
+    def clear_expired(self) -> None:
+        """Forget the requests which timed out.
+
+        Their responses will not arrive anymore, e.g. after reconnecting.
+        """
+        for request in [request for request in self._pending if request.expired]:
+            self.remove(request)
+
+    def fail(self, err: Exception) -> None:
+        """Fail the oldest request still waiting for a response."""
+        for request in self._pending:
+            if request.expired is None:
+                self.remove(request)
+                if not request.future.done():
+                    request.future.set_exception(err)
+                return
+
+    def feed(self, data: bytes) -> bool:
+        """Add notification data to the pending requests.
+
+        Returns False if (part of) the data was discarded.
+        """
+        if self._partial_header:
+            data = self._partial_header + data
+            self._partial_header = b""
+        self._prune(time.monotonic())
+        view = memoryview(data)
+        in_sync = True
+        while len(view) > 0:
+            if self._current is None:
+                offset, request = self._find_frame(view)
+                if offset > 0:
+                    _LOGGER.debug("Discarded %s bytes without a matching header", offset)
+                    in_sync = False
+                view = view[offset:]
+                if request is None:
+                    # Might be the start of a header
+                    self._partial_header = bytes(view)
+                    break
+                self._start(request)
+
+            request = self._current
+            buffer = request.buffer
+            size = min(len(view), buffer.missing(view))
+            request.fragments += 1
+            buffer.add(view[:size])
+            view = view[size:]
+
+            if not buffer.is_complete():
+                continue
+            if buffer.is_valid():
+                self._skip_before(request)
+                if buffer.is_exception():
+                    msg = f"MODBUS Exception {buffer.command}: {buffer.response[2]}"
+                    self._finish(request, ModbusError(msg))
+                else:
+                    self._finish(request, None)
+                continue
+            # Look for the next frame in the broken one
+            offset, match = self._find_frame(buffer.response[1:])
+            if offset + 1 < buffer.size:
+                view = memoryview(bytes(buffer.response[offset + 1 :]) + bytes(view))
+                in_sync = False
+            if buffer.is_exception():
+                # Most likely register data looking like an exception header
+                _LOGGER.debug("Invalid exception for %s, resyncing", buffer.command)
+            elif match is None:
+                self._finish(request, ParseError("Failed checksum"))
+                continue
+            else:
+                _LOGGER.debug(
+                    "Response to %s ran into the next frame, resyncing", buffer.command
+                )
+            buffer.reset()
+            self._current = None
+        return in_sync
+
+    def _prune(self, now: float) -> None:
+        """Stop waiting for late responses which did not start in time."""
+        for request in list(self._pending):
+            if (
+                request.expired is not None
+                and request is not self._current
+                and now - request.expired > self.late_timeout
+            ):
+                self.remove(request)
+
+    def _find_frame(self, data: memoryview) -> tuple[int, PendingRequest | None]:
+        """Find the first header matching a pending request.
+
+        Returns its offset and request. If there is none, the request is
+        None and the offset is where a header might start, but got cut
+        off.
+        """
+        for offset in range(len(data)):
+            if data[offset] != MODBUS_DEVICE_ADDRESS:
+                continue
+            header = data[offset:]
+            if len(header) < MODBUS_HEADER_SIZE:
+                return offset, None
+            for request in self._pending:
+                if request.buffer.matches(header):
+                    return offset, request
+        return len(data), None
+
+    def _start(self, request: PendingRequest) -> None:
+        """Start receiving the frame of a request."""
+        self._current = request
+        if request.first_fragment is None:
+            request.first_fragment = time.monotonic()
+
+    def _skip_before(self, request: PendingRequest) -> None:
+        """Fail the requests before one which got a valid response.
+
+        They will not get a response anymore.
+        """
+        while self._pending[0] is not request:
+            skipped = self._pending.popleft()
+            if skipped.expired is not None:
+                continue
+            _LOGGER.debug("No response to %s", skipped.buffer.command)
+            if not skipped.future.done():
+                skipped.future.set_exception(TimeoutError("No response"))
+
+    def _finish(self, request: PendingRequest, err: Exception | None) -> None:
+        """Resolve a request and remove it from the queue."""
+        self.remove(request)
+        if request.expired is not None:
+            _LOGGER.debug("Discarded late response to %s", request.buffer.command)
+            return
+        if request.future.done():
+            return
+        request.finished = time.monotonic()
+        if err is None:
+            request.future.set_result(request.buffer.body())
+        else:
+            request.future.set_exception(err)
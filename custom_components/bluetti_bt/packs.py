@@ -0,0 +1,51 @@
+"""Battery pack data cache."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CachedPack:
+    """Last data read from a battery pack."""
+
+    data: dict[str, Any]
+    summary: tuple
+    updated: float
+
+
+class PackCache:
+    """Cache for battery pack data.
+
+    A pack is only read again if its refresh period expired or the
+    battery summary of the device has changed since the last read.
+    """
+
+    def __init__(
+        self,
+        refresh_period: float,
+        summary_changed: Callable[[tuple, tuple], bool] | None = None,
+    ) -> None:
+        """Init cache."""
+        self.refresh_period = refresh_period
+        self._summary_changed = summary_changed or (lambda old, new: old != new)
+        self._packs: dict[int, CachedPack] = {}
+
+    def get(self, pack: int, summary: tuple, now: float) -> dict[str, Any] | None:
+        """Get cached data of a pack if it is still valid."""
+        cached = self._packs.get(pack)
+        if cached is None:
+            return None
+        if self._summary_changed(cached.summary, summary) or now - cached.updated >= self.refresh_period:
+            return None
+        return cached.data
+
+    def update(self, pack: int, data: dict[str, Any], summary: tuple, now: float) -> None:
+        """Store data read from a pack."""
+        self._packs[pack] = CachedPack(data, summary, now)
+
+    def clear(self) -> None:
+        """Remove all cached packs."""
+        self._packs.clear()
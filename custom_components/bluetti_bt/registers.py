@@ -0,0 +1,169 @@
+"""Register range planning for Bluetti polling and writes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+import struct
+from typing import List
+
+from bluetti_mqtt.core.commands import (
+    DeviceCommand,
+    ReadHoldingRegisters,
+    WriteMultipleRegisters,
+    WriteSingleRegister,
+)
+from bluetti_mqtt.core.devices.bluetti_device import BluettiDevice
+
+# Hard limit of a MODBUS read holding registers request
+MODBUS_MAX_READ_REGISTERS = 125
+# Hard limit of a MODBUS write multiple registers request
+MODBUS_MAX_WRITE_REGISTERS = 123
+
+
+@dataclass
+class CoalescedRead:
+    """A single read covering one or more register ranges."""
+
+    command: ReadHoldingRegisters
+    parts: List[ReadHoldingRegisters] = field(default_factory=list)
+
+    def split(self, body: memoryview | bytes) -> Iterator[tuple[int, bytes]]:
+        """Split a response body back into one body per register range.
+
+        This is the only place where the body is copied.
+        """
+        start = self.command.starting_address
+        for part in self.parts:
+            offset = 2 * (part.starting_address - start)
+            yield part.starting_address, bytes(body[offset : offset + 2 * part.quantity])
+
+
+def plan_reads(
+    commands: Iterable[ReadHoldingRegisters],
+    max_registers: int,
+    max_gap: int,
+    device_reads: Iterable[ReadHoldingRegisters] = (),
+) -> list[CoalescedRead]:
+    """Merge adjacent and nearby register ranges into as few reads as possible.
+
+    Two ranges are merged if the registers between them (the gap) are not
+    more than max_gap, or all lie within one of the device_reads, and the
+    merged read does not exceed max_registers. device_reads are the reads
+    known to work on the device, so the plan never needs more reads than
+    those.
+    """
+    max_registers = min(max_registers, MODBUS_MAX_READ_REGISTERS)
+    ordered = sorted(commands, key=lambda c: (c.starting_address, c.quantity))
+    device_ranges = [
+        range(read.starting_address, read.starting_address + read.quantity)
+        for read in device_reads
+    ]
+
+    planned: list[CoalescedRead] = []
+    start = end = 0  # end is exclusive
+    parts: list[ReadHoldingRegisters] = []
+
+    for command in ordered:
+        cmd_end = command.starting_address + command.quantity
+        if parts:
+            gap = command.starting_address - end
+            bridged = gap <= max_gap or any(
+                end in device_range and command.starting_address - 1 in device_range
+                for device_range in device_ranges
+            )
+            if bridged and max(end, cmd_end) - start <= max_registers:
+                end = max(end, cmd_end)
+                parts.append(command)
+                continue
+            planned.append(_build_read(start, end, parts))
+        start, end, parts = command.starting_address, cmd_end, [command]
+
+    if parts:
+        planned.append(_build_read(start, end, parts))
+
+    return planned
+
+
+def _build_read(
+    start: int, end: int, parts: list[ReadHoldingRegisters]
+) -> CoalescedRead:
+    """Create the read for a merged range."""
+    if len(parts) == 1:
+        return CoalescedRead(parts[0], parts)
+    return CoalescedRead(ReadHoldingRegisters(start, end - start), parts)
+
+
+def plan_writes(
+    registers: dict[int, int], writable_ranges: Iterable[range] = ()
+) -> list[DeviceCommand]:
+    """Merge register writes into as few commands as possible.
+
+    Contiguous registers are written with a single write multiple
+    registers request, all others with write single register. A request
+    never spans more than one of the writable ranges.
+    """
+    writable_ranges = list(writable_ranges)
+    planned: list[DeviceCommand] = []
+    run: list[int] = []
+    run_range: range | None = None
+
+    for address in sorted(registers):
+        address_range = next((r for r in writable_ranges if address in r), None)
+        if run and (
+            address != run[-1] + 1
+            or len(run) == MODBUS_MAX_WRITE_REGISTERS
+            or address_range != run_range
+        ):
+            planned.append(_build_write(run, registers))
+            run = []
+        if not run:
+            run_range = address_range
+        run.append(address)
+
+    if run:
+        planned.append(_build_write(run, registers))
+
+    return planned
+
+
+def _build_write(addresses: list[int], registers: dict[int, int]) -> DeviceCommand:
+    """Create the write for contiguous registers."""
+    if len(addresses) == 1:
+        return WriteSingleRegister(addresses[0], registers[addresses[0]])
+    values = [registers[address] for address in addresses]
+    return WriteMultipleRegisters(addresses[0], struct.pack(f"!{len(values)}H", *values))
+
+
+def written_registers(command: DeviceCommand) -> range:
+    """Get the registers a write command changes."""
+    if isinstance(command, WriteSingleRegister):
+        return range(command.address, command.address + 1)
+    if isinstance(command, WriteMultipleRegisters):
+        return range(
+            command.starting_address, command.starting_address + len(command.data) // 2
+        )
+    return range(0)
+
+
+def build_register_map(
+    device: BluettiDevice, commands: Iterable[ReadHoldingRegisters]
+) -> dict[str, list[ReadHoldingRegisters]]:
+    """Map field names to the register ranges they are read from.
+
+    Only fields which are completely covered by one of the commands are mapped.
+    """
+    commands = list(commands)
+    register_map: dict[str, list[ReadHoldingRegisters]] = {}
+    for device_field in device.struct.fields:
+        field_end = device_field.address + device_field.size
+        for command in commands:
+            if (
+                command.starting_address <= device_field.address
+                and field_end <= command.starting_address + command.quantity
+            ):
+                register_map.setdefault(device_field.name, []).append(
+                    ReadHoldingRegisters(device_field.address, device_field.size)
+                )
+                break
+    return register_map
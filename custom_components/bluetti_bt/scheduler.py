@@ -0,0 +1,111 @@
+"""Polling tiers for Bluetti fields."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from enum import Enum, IntEnum, unique
+import math
+
+from bluetti_mqtt.core.commands import DeviceCommand
+
+from .const import SLOW_FIELDS, STATIC_FIELDS
+
+
+@unique
+class PollingTier(Enum):
+    """How often fields are polled."""
+
+    FAST = "fast"  # Every cycle (power, SOC, outputs)
+    SLOW = "slow"  # Pack, cell and settings data
+    STATIC = "static"  # Identity, read once
+
+
+@unique
+class CommandPriority(IntEnum):
+    """Which commands are kept when a polling cycle runs out of time."""
+
+    LOW = 0  # Dropped first (packs, cells, settings, identity)
+    HIGH = 1  # Sent while time is left (power, SOC, outputs, writes)
+
+
+TIER_PRIORITIES = {
+    PollingTier.FAST: CommandPriority.HIGH,
+    PollingTier.SLOW: CommandPriority.LOW,
+    PollingTier.STATIC: CommandPriority.LOW,
+}
+
+
+def field_tier(key: str) -> PollingTier:
+    """Get the polling tier of a field."""
+    if key in STATIC_FIELDS:
+        return PollingTier.STATIC
+    if key in SLOW_FIELDS:
+        return PollingTier.SLOW
+    return PollingTier.FAST
+
+
+class TierScheduler:
+    """Keeps track of the next due time of each polling tier."""
+
+    def __init__(self, intervals: dict[PollingTier, float | None]) -> None:
+        """Init scheduler.
+
+        An interval of None means that the tier is only polled once
+        until it is reset.
+        """
+        self._intervals = intervals
+        self._next_due: dict[PollingTier, float] = {}
+
+    def interval(self, tier: PollingTier) -> float | None:
+        """Get the polling interval of a tier."""
+        return self._intervals.get(tier)
+
+    def due_tiers(self, now: float) -> set[PollingTier]:
+        """Get the tiers which have to be polled."""
+        return {
+            tier for tier in PollingTier if self._next_due.get(tier, 0) <= now
+        }
+
+    def mark_polled(self, tiers: Iterable[PollingTier], now: float) -> None:
+        """Schedule the next poll of the given tiers."""
+        for tier in tiers:
+            interval = self._intervals.get(tier)
+            self._next_due[tier] = math.inf if interval is None else now + interval
+
+    def reset(self, tier: PollingTier) -> None:
+        """Make a tier due immediately."""
+        self._next_due.pop(tier, None)
+
+
+class CycleBudget:
+    """Time left for the commands of a polling cycle.
+
+    Low priority commands are only sent if they are expected to finish
+    with a share of the budget left over, which is kept for the high
+    priority commands and their retries. High priority commands are sent
+    as long as any time is left.
+    """
+
+    def __init__(self, now: float, duration: float, reserve: float) -> None:
+        """Init budget.
+
+        Times are seconds of the event loop clock, reserve is the share of
+        the duration kept by low priority commands.
+        """
+        self.deadline = now + duration
+        self._reserve = reserve * duration
+        self.dropped: list[DeviceCommand] = []
+
+    def remaining(self, now: float) -> float:
+        """Get the time left."""
+        return max(self.deadline - now, 0)
+
+    def allows(self, priority: CommandPriority, expected: float, now: float) -> bool:
+        """Check if a command expected to take the given time can be sent."""
+        if priority is CommandPriority.HIGH:
+            return self.remaining(now) > 0
+        return self.remaining(now) - expected >= self._reserve
+
+    def drop(self, *commands: DeviceCommand) -> None:
+        """Record commands which were not sent."""
+        self.dropped.extend(commands)
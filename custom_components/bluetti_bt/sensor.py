@@ -5,45 +5,56 @@ from enum import Enum
 
 import logging
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
-from homeassistant.components.sensor import SensorEntity, CONF_STATE_CLASS
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import (
     CONF_ADDRESS,
-    CONF_NAME,
-    CONF_UNIT_OF_MEASUREMENT,
-    CONF_DEVICE_CLASS,
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     EntityCategory,
+    Platform,
+    UnitOfTime,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
-
-from bluetti_mqtt.bluetooth import build_device
-from bluetti_mqtt.mqtt_client import (
-    NORMAL_DEVICE_FIELDS,
-    DC_INPUT_FIELDS,
-    MqttFieldType,
-    battery_pack_fields,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import device_info as dev_info, get_unique_id
-from .const import DATA_COORDINATOR, DOMAIN, CONF_OPTIONS, DIAGNOSTIC_FIELDS, ADDITIONAL_DEVICE_FIELDS
-from .coordinator import PollingCoordinator, DummyDevice
+from .breaker import BreakerState
+from .catalog import get_entity_descriptors
+from .const import DATA_COORDINATOR, DATA_DEVICE, DOMAIN
+from .entity import BluettiEntity
 from .utils import unique_id_loggable
 
+if TYPE_CHECKING:
+    from .coordinator import PollingCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
+# Command and adapter metrics exposed as sensors: summary key, name, unit
+METRIC_SENSORS = [
+    ("latency_p50", "Command latency p50", UnitOfTime.MILLISECONDS),
+    ("latency_p95", "Command latency p95", UnitOfTime.MILLISECONDS),
+    ("latency_p99", "Command latency p99", UnitOfTime.MILLISECONDS),
+    ("duration_p95", "Command response time p95", UnitOfTime.MILLISECONDS),
+    ("error_rate", "Command error rate", PERCENTAGE),
+    ("adapter_depth", "Adapter queue depth", None),
+    ("adapter_wait_p95", "Adapter queue wait p95", UnitOfTime.MILLISECONDS),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Setup sensor entities."""
 
-    device_name = entry.data.get(CONF_NAME)
     address = entry.data.get(CONF_ADDRESS)
     if address is None:
         _LOGGER.error("Device has no address")
@@ -53,57 +64,35 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors according to device_info
-    bluetti_device = build_device(address, device_name)
-    bluetti_device = DummyDevice(bluetti_device)
-
-    sensors_to_add = []
-    all_fields = NORMAL_DEVICE_FIELDS
-    all_fields.update(DC_INPUT_FIELDS)
-    all_fields.update(ADDITIONAL_DEVICE_FIELDS)
-
-    if len(bluetti_device.pack_polling_commands) > 0:
-        # add pack fields for device
-        _LOGGER.info("Device type(%s) pack_num_max(%s)", bluetti_device.type, bluetti_device.pack_num_max)
-        for pack in range (1, bluetti_device.pack_num_max + 1):
-            for name, field in battery_pack_fields(pack).items():
-                all_fields.update({name+str(pack): field})
-
-    for field_key, field_config in all_fields.items():
-        if bluetti_device.has_field(field_key) or field_config.id_override is not None:
-            category = None
-            if field_config.setter is True or field_key in DIAGNOSTIC_FIELDS:
-                category = EntityCategory.DIAGNOSTIC
-            if field_config.type == MqttFieldType.NUMERIC:
-                sensors_to_add.append(
-                    BluettiSensor(
-                        hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                        device_info,
-                        address,
-                        field_key,
-                        field_config.home_assistant_extra.get(CONF_NAME, ""),
-                        field_config.home_assistant_extra.get(CONF_UNIT_OF_MEASUREMENT),
-                        field_config.home_assistant_extra.get(CONF_DEVICE_CLASS),
-                        field_config.home_assistant_extra.get(CONF_STATE_CLASS),
-                        category=category,
-                    )
-                )
-            elif field_config.type == MqttFieldType.ENUM:
-                sensors_to_add.append(
-                    BluettiSensor(
-                        hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                        device_info,
-                        address,
-                        field_key,
-                        field_config.home_assistant_extra.get(CONF_NAME, ""),
-                        options=field_config.home_assistant_extra.get(CONF_OPTIONS),
-                        category=category,
-                    )
-                )
+    bluetti_device = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+    sensors_to_add = [
+        BluettiSensor(
+            coordinator,
+            device_info,
+            address,
+            descriptor.key,
+            descriptor.name,
+            descriptor.unit_of_measurement,
+            descriptor.device_class,
+            descriptor.state_class,
+            category=descriptor.category,
+            options=descriptor.options,
+        )
+        for descriptor in get_entity_descriptors(bluetti_device, Platform.SENSOR)
+    ]
+    sensors_to_add.extend(
+        BluettiMetricSensor(coordinator, device_info, key, name, unit)
+        for key, name, unit in METRIC_SENSORS
+    )
+    sensors_to_add.append(BluettiBreakerSensor(coordinator, device_info))
+    sensors_to_add.append(BluettiSignalSensor(coordinator, device_info))
 
     async_add_entities(sensors_to_add)
 
 
-class BluettiSensor(CoordinatorEntity, SensorEntity):
+class BluettiSensor(BluettiEntity, SensorEntity):
     """Bluetti universal sensor."""
 
     def __init__(
@@ -117,7 +106,7 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         device_class: str | None = None,
         state_class: str | None = None,
         category: EntityCategory | None = None,
-        options: list[str] | None = None,
+        options: tuple[str, ...] | None = None,
     ):
         """Init battery entity."""
         super().__init__(coordinator)
@@ -128,7 +117,6 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
 
         self._attr_device_info = device_info
         self._attr_name = e_name
-        self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
         self._attr_native_unit_of_measurement = unit_of_measurement
         self._attr_device_class = device_class
@@ -138,14 +126,18 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+        """Handle updated data from the coordinator.
 
-        if self.coordinator.persistent_conn and not self.coordinator.client.is_connected:
-            return
+        The state is always written, availability comes from the field age.
+        """
+        self._update_attributes()
+        self.async_write_ha_state()
 
+    def _update_attributes(self) -> None:
+        """Take the value of the field from the coordinator data."""
         if self.coordinator.data is None:
             _LOGGER.warning(
-                "Data from coordinator is None. Skipping update for %s",
+                "Data from coordinator is None, keeping the value of %s",
                 unique_id_loggable(self._attr_unique_id)
             )
             return
@@ -155,13 +147,11 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
             _LOGGER.warning(
                 "Invalid data from coordinator (sensor.%s)", unique_id_loggable(self._attr_unique_id)
             )
-            self._attr_available = False
             return
 
         response_data = self.coordinator.data.get(self._response_key)
         if response_data is None:
             _LOGGER.warning("No data for available for (%s)", self._response_key)
-            self._attr_available = False
             return
 
         if (
@@ -177,11 +167,8 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
                 response_data,
                 type(response_data),
             )
-            self._attr_available = False
             return
 
-        self._attr_available = True
-
         # Different for enum and numeric
         if (
             self._options is not None
@@ -193,4 +180,105 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         else:
             # Numeric
             self._attr_native_value = response_data
-        self.async_write_ha_state()
+
+
+class BluettiMetricSensor(CoordinatorEntity, SensorEntity):
+    """Bluetti command metric sensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: PollingCoordinator,
+        device_info: DeviceInfo,
+        metric_key: str,
+        name: str,
+        unit_of_measurement: str | None,
+    ):
+        """Init metric entity."""
+        super().__init__(coordinator)
+
+        e_name = f"{device_info.get('name')} {name}"
+        self._metric_key = metric_key
+
+        self._attr_device_info = device_info
+        self._attr_name = e_name
+        self._attr_unique_id = get_unique_id(e_name)
+        self._attr_native_unit_of_measurement = unit_of_measurement
+
+    @property
+    def available(self) -> bool:
+        """Metrics are also available if polling failed."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the metric."""
+        value = self.coordinator.metric_summary().get(self._metric_key)
+        if value is None:
+            return None
+        return round(value, 1)
+
+
+class BluettiBreakerSensor(CoordinatorEntity, SensorEntity):
+    """Shows if polling is paused because the device is unreachable."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [state.value for state in BreakerState]
+    _attr_translation_key = "circuit_breaker"
+
+    def __init__(self, coordinator: PollingCoordinator, device_info: DeviceInfo):
+        """Init breaker entity."""
+        super().__init__(coordinator)
+
+        e_name = f"{device_info.get('name')} Connection state"
+        self._attr_device_info = device_info
+        self._attr_name = e_name
+        self._attr_unique_id = get_unique_id(e_name)
+
+    @property
+    def available(self) -> bool:
+        """State is also available if polling failed."""
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the breaker state."""
+        return self.coordinator.circuit_breaker.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return failed polls in a row."""
+        return {"failures": self.coordinator.circuit_breaker.failures}
+
+
+class BluettiSignalSensor(CoordinatorEntity, SensorEntity):
+    """Signal strength of the last advertisement."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+
+    def __init__(self, coordinator: PollingCoordinator, device_info: DeviceInfo):
+        """Init signal entity."""
+        super().__init__(coordinator)
+
+        e_name = f"{device_info.get('name')} Signal strength"
+        self._attr_device_info = device_info
+        self._attr_name = e_name
+        self._attr_unique_id = get_unique_id(e_name)
+
+    @property
+    def available(self) -> bool:
+        """Return if the device is in range."""
+        return self.coordinator.rssi is not None and self.coordinator.device_present
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the RSSI."""
+        return self.coordinator.rssi
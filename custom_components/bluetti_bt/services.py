@@ -0,0 +1,85 @@
+"""Services for Bluetti BT."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import (
+    ATTR_ADDRESS,
+    ATTR_VALUES,
+    CONF_USE_CONTROLS,
+    DATA_COORDINATOR,
+    DOMAIN,
+    SERVICE_WRITE_REGISTERS,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import PollingCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_ADDRESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=0xFFFF)),
+        vol.Required(ATTR_VALUES): vol.All(
+            cv.ensure_list,
+            vol.Length(min=1),
+            [vol.All(vol.Coerce(int), vol.Range(min=0, max=0xFFFF))],
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_WRITE_REGISTERS):
+        return
+
+    async def async_write_registers(call: ServiceCall) -> None:
+        """Write consecutive registers, starting at address."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        address = call.data[ATTR_ADDRESS]
+        registers = {
+            address + offset: value for offset, value in enumerate(call.data[ATTR_VALUES])
+        }
+        try:
+            verified = await coordinator.async_write_registers(registers)
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if not verified:
+            raise HomeAssistantError(f"Could not write registers {list(registers)}")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_REGISTERS,
+        async_write_registers,
+        schema=WRITE_REGISTERS_SCHEMA,
+    )
+
+
+def _get_coordinator(hass: HomeAssistant, device_id: str) -> PollingCoordinator:
+    """Get the coordinator of a device with controls enabled."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        raise ServiceValidationError(f"Unknown device {device_id}")
+
+    for entry_id in device.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            continue
+        if entry.data.get(CONF_USE_CONTROLS) is not True:
+            raise ServiceValidationError("Controls are not enabled for this device")
+        coordinator = hass.data[DOMAIN].get(entry_id, {}).get(DATA_COORDINATOR)
+        if coordinator is not None:
+            return coordinator
+
+    raise ServiceValidationError(f"Device {device_id} is not a loaded Bluetti device")
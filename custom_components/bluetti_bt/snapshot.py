@@ -0,0 +1,111 @@
+"""Last known device state, kept across restarts."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from bluetti_mqtt.core.devices.bluetti_device import BluettiDevice
+from bluetti_mqtt.core.devices.struct import EnumField
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+
+
+def _storage_key(entry_id: str) -> str:
+    """Get the storage key of a config entry."""
+    return f"{DOMAIN}.{entry_id}"
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored state of a config entry."""
+    await Store(hass, SNAPSHOT_STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+class _Store(Store[dict[str, Any]]):
+    """Store which drops data of other versions."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Drop the data, it is only a cache of the last poll."""
+        return {}
+
+
+class SnapshotStore:
+    """Stores the parsed data of a device.
+
+    Decimals and enums are not JSON types, they are stored tagged and
+    converted back on load. Data stored with another version is dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, device: BluettiDevice) -> None:
+        """Init store."""
+        self._store = _Store(hass, SNAPSHOT_STORAGE_VERSION, _storage_key(entry_id))
+        self._enums: dict[str, type[Enum]] = {
+            f.name: f.enum for f in device.struct.fields if isinstance(f, EnumField)
+        }
+        self._data: dict[str, Any] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the stored data, None if there is none."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict) or not isinstance(stored.get("data"), dict):
+            return None
+        data = {}
+        for key, value in stored["data"].items():
+            try:
+                data[key] = self._decode(key, value)
+            except (KeyError, ValueError, ArithmeticError):
+                # Field changed since the data was stored
+                continue
+        return data
+
+    @callback
+    def async_schedule_save(self, data: dict[str, Any]) -> None:
+        """Save the data after a delay.
+
+        Calls until then only replace the data, so it is written at most
+        once per delay.
+        """
+        self._data = data
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._encode_data, SNAPSHOT_SAVE_DELAY)
+
+    def _encode_data(self) -> dict[str, Any]:
+        """Get the data to store."""
+        self._save_pending = False
+        return {
+            "data": {
+                key: self._encode(value)
+                for key, value in self._data.items()
+                if value is not None
+            }
+        }
+
+    def _encode(self, value: Any) -> Any:
+        """Make a value JSON serializable."""
+        if isinstance(value, Enum):
+            return {"enum": value.name}
+        if isinstance(value, Decimal):
+            return {"decimal": str(value)}
+        if isinstance(value, list):
+            return [self._encode(item) for item in value]
+        return value
+
+    def _decode(self, key: str, value: Any) -> Any:
+        """Convert a stored value back."""
+        if isinstance(value, dict):
+            if "decimal" in value:
+                return Decimal(value["decimal"])
+            # Pack fields have the pack number appended
+            enum = self._enums.get(key) or self._enums[key.rstrip("0123456789")]
+            return enum[value["enum"]]
+        if isinstance(value, list):
+            return [self._decode(key, item) for item in value]
+        return value
@@ -0,0 +1,53 @@
+"""Polled field values with the time they were read."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class FieldValue:
+    """Last value read for a field."""
+
+    value: Any
+    updated: float  # Monotonic time
+    source: str  # Command the value was read with
+
+
+class FieldStates:
+    """Last values of all fields, kept across failed polls.
+
+    The version is increased with every update, so consumers can tell
+    if anything changed.
+    """
+
+    def __init__(self) -> None:
+        """Init states."""
+        self._fields: dict[str, FieldValue] = {}
+        self.version = 0
+
+    def get(self, key: str) -> FieldValue | None:
+        """Get the state of a field."""
+        return self._fields.get(key)
+
+    def value(self, key: str) -> Any:
+        """Get the value of a field, None if unknown."""
+        state = self._fields.get(key)
+        return state.value if state is not None else None
+
+    def update(self, values: dict[str, Any], source: str, now: float) -> None:
+        """Store values read with a command."""
+        if not values:
+            return
+        for key, value in values.items():
+            self._fields[key] = FieldValue(value, now, source)
+        self.version += 1
+
+    def values(self) -> dict[str, Any]:
+        """Get the values of all fields."""
+        return {key: state.value for key, state in self._fields.items()}
+
+    def ages(self, now: float) -> dict[str, tuple[float, str]]:
+        """Get the age in seconds and source of all fields."""
+        return {key: (now - state.updated, state.source) for key, state in self._fields.items()}
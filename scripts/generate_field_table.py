@@ -0,0 +1,115 @@
+"""Generate custom_components/bluetti_bt/field_table.py.
+
+Usage: python scripts/generate_field_table.py
+
+Needs Home Assistant and bluetti_mqtt installed. Run it after updating
+bluetti_mqtt or changing ADDITIONAL_DEVICE_FIELDS, so the integration
+never has to import bluetti_mqtt.mqtt_client at runtime.
+"""
+
+from __future__ import annotations
+
+from importlib.metadata import version
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from bluetti_mqtt.bluetooth import DEVICE_NAME_RE
+from bluetti_mqtt.mqtt_client import (
+    DC_INPUT_FIELDS,
+    NORMAL_DEVICE_FIELDS,
+    battery_pack_fields,
+)
+
+from custom_components.bluetti_bt.const import ADDITIONAL_DEVICE_FIELDS
+from custom_components.bluetti_bt.coordinator import build_dummy_device
+
+OUTPUT = Path(__file__).parents[1] / "custom_components/bluetti_bt/field_table.py"
+
+# Only these extras are used by the integration
+EXTRA_KEYS = ("name", "unit_of_measurement", "device_class", "state_class", "options")
+
+
+def device_types() -> list[str]:
+    """Get all device types bluetti_mqtt knows."""
+    return DEVICE_NAME_RE.pattern.split("(")[1].split(")")[0].split("|")
+
+
+def device_fields(device_type: str, all_fields: dict) -> dict:
+    """Get the field configs of a device type, by entity key."""
+    device = build_dummy_device("00:00:00:00:00:00", f"{device_type}0")
+    fields = {}
+
+    field_names = dict.fromkeys(f.name for f in device.struct.fields)
+    for field_key in field_names:
+        if field_key in all_fields:
+            fields[field_key] = all_fields[field_key]
+
+    # Fields with id override are always added
+    for field_key, field_config in all_fields.items():
+        if field_config.id_override is not None and field_key not in field_names:
+            fields[field_key] = field_config
+
+    if len(device.pack_polling_commands) > 0:
+        for pack in range(1, device.pack_num_max + 1):
+            for name, field_config in battery_pack_fields(pack).items():
+                fields[name + str(pack)] = field_config
+
+    return fields
+
+
+def field_row(field_key: str, field_config) -> str:
+    """Format a field config as a line of the table."""
+    extra = {
+        key: value
+        for key, value in field_config.home_assistant_extra.items()
+        if key in EXTRA_KEYS
+    }
+    args = [
+        f"FieldType.{field_config.type.name}",
+        repr(field_config.setter),
+        repr(field_config.advanced),
+        repr(extra).replace("'", '"'),
+    ]
+    if field_config.id_override is not None:
+        args.append(f'id_override="{field_config.id_override}"')
+    return f'    "{field_key}": FieldConfig({", ".join(args)}),'
+
+
+def main() -> None:
+    """Write the table."""
+    all_fields = {**NORMAL_DEVICE_FIELDS, **DC_INPUT_FIELDS, **ADDITIONAL_DEVICE_FIELDS}
+    by_type = {device_type: device_fields(device_type, all_fields) for device_type in device_types()}
+
+    fields = {}
+    for type_fields in by_type.values():
+        fields.update(type_fields)
+
+    lines = [
+        '"""Field table by device type.',
+        "",
+        f"Generated by scripts/generate_field_table.py from bluetti_mqtt {version('bluetti_mqtt')}.",
+        "Do not edit.",
+        '"""',
+        "",
+        "from .fields import FieldConfig, FieldType",
+        "",
+        "FIELDS: dict[str, FieldConfig] = {",
+        *(field_row(key, config) for key, config in fields.items()),
+        "}",
+        "",
+        "DEVICE_FIELDS: dict[str, tuple[str, ...]] = {",
+    ]
+    for device_type, type_fields in by_type.items():
+        lines.append(f'    "{device_type}": (')
+        lines.extend(f'        "{key}",' for key in type_fields)
+        lines.append("    ),")
+    lines.append("}")
+
+    OUTPUT.write_text("\n".join(lines) + "\n")
+    print(f"Wrote {len(fields)} fields of {len(by_type)} device types to {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
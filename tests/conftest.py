@@ -0,0 +1,80 @@
+"""Fixtures for Bluetti tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fake_device import MODEL_NAMES, FakeBleakClient
+from custom_components.bluetti_bt import connection, coordinator as coordinator_module
+from custom_components.bluetti_bt.connection import ConnectionMode
+from custom_components.bluetti_bt.const import DOMAIN
+from custom_components.bluetti_bt.coordinator import (
+    DummyDevice,
+    PollingCoordinator,
+    build_dummy_device,
+)
+from custom_components.bluetti_bt.field_table import DEVICE_FIELDS
+
+ADDRESS = "00:11:22:33:44:55"
+DEVICE_TYPES = sorted(DEVICE_FIELDS)
+
+
+def build_coordinator(hass: HomeAssistant, model: str) -> PollingCoordinator:
+    """Build a coordinator for a simulated model, polled by the tests only."""
+    hass.data[DOMAIN] = {ADDRESS: {}}
+    coordinator = PollingCoordinator(
+        hass,
+        ADDRESS,
+        build_dummy_device(ADDRESS, MODEL_NAMES[model]),
+        polling_interval=20,
+        connection_mode=ConnectionMode.NEVER,
+        polling_timeout=45,
+        max_retries=3,
+        pack_polling_interval=300,
+    )
+    coordinator.config_entry = SimpleNamespace(entry_id=ADDRESS, pref_disable_polling=True)
+    return coordinator
+
+
+@pytest.fixture(params=DEVICE_TYPES)
+def device(request: pytest.FixtureRequest) -> DummyDevice:
+    """Device model of every supported type."""
+    return build_dummy_device(ADDRESS, f"{request.param}0")
+
+
+@contextmanager
+def patch_fake_client(model: str) -> Iterator[FakeBleakClient]:
+    """Connect coordinators built meanwhile to a fake device in range."""
+    client = FakeBleakClient(build_dummy_device(ADDRESS, MODEL_NAMES[model]))
+    with patch.object(
+        coordinator_module.bluetooth, "async_ble_device_from_address", return_value=None
+    ), patch.object(
+        coordinator_module.bluetooth, "async_address_present", return_value=True
+    ), patch.object(coordinator_module, "BleakClient", return_value=client), patch.object(
+        connection.bluetooth, "async_last_service_info", return_value=None
+    ):
+        yield client
+
+
+@pytest.fixture
+def fake_client() -> Iterator[FakeBleakClient]:
+    """Fake EB3A in range of the adapter."""
+    with patch_fake_client("EB3A") as client:
+        yield client
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, fake_client: FakeBleakClient
+) -> AsyncIterator[PollingCoordinator]:
+    """Coordinator polling the fake EB3A."""
+    coordinator = build_coordinator(hass, "EB3A")
+    yield coordinator
+    await coordinator.async_shutdown()
@@ -0,0 +1,98 @@
+"""Tests for the circuit breaker."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.bluetti_bt import breaker
+from custom_components.bluetti_bt.breaker import BreakerState, CircuitBreaker, backoff_delay
+
+
+def test_backoff_delay_grows_to_maximum() -> None:
+    """The upper bound of the delay doubles per attempt up to the maximum."""
+    with patch.object(breaker.random, "uniform", side_effect=lambda low, high: high):
+        delays = [backoff_delay(attempt, 1, 10) for attempt in range(1, 7)]
+
+    assert delays == [1, 2, 4, 8, 10, 10]
+
+
+def test_backoff_delay_has_jitter() -> None:
+    """Delays are spread between zero and the upper bound."""
+    delays = [backoff_delay(3, 1, 10) for _ in range(100)]
+
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_opens_after_threshold() -> None:
+    """Polls fail fast after the threshold of failures in a row."""
+    circuit = CircuitBreaker(3, 60, 600)
+
+    for now in (0, 10):
+        circuit.record_failure(now)
+        assert circuit.state is BreakerState.CLOSED
+        assert circuit.allow(now)
+    circuit.record_failure(20)
+
+    assert circuit.state is BreakerState.OPEN
+    assert not circuit.allow(21)
+    assert not circuit.allow(79)
+
+
+def test_success_resets_failures() -> None:
+    """Failures only count while they are in a row."""
+    circuit = CircuitBreaker(3, 60, 600)
+
+    circuit.record_failure(0)
+    circuit.record_failure(10)
+    circuit.record_success()
+    circuit.record_failure(20)
+    circuit.record_failure(30)
+
+    assert circuit.state is BreakerState.CLOSED
+    assert circuit.allow(31)
+
+
+def test_half_open_after_reset_timeout() -> None:
+    """One poll is tried after the reset timeout, success closes the breaker."""
+    circuit = CircuitBreaker(1, 60, 600)
+    circuit.record_failure(0)
+
+    assert circuit.allow(60)
+    assert circuit.state is BreakerState.HALF_OPEN
+
+    circuit.record_success()
+    assert circuit.state is BreakerState.CLOSED
+    assert circuit.failures == 0
+
+
+def test_reset_timeout_doubles_to_maximum() -> None:
+    """Every failed try in half-open state doubles the reset timeout."""
+    circuit = CircuitBreaker(1, 60, 200)
+    circuit.record_failure(0)
+    now = 0.0
+    timeouts = []
+    for _ in range(4):
+        now = circuit.opened_until
+        assert circuit.allow(now)
+        circuit.record_failure(now)
+        assert circuit.state is BreakerState.OPEN
+        timeouts.append(circuit.opened_until - now)
+
+    assert timeouts == [120, 200, 200, 200]
+
+    circuit.allow(circuit.opened_until)
+    circuit.record_success()
+    circuit.record_failure(now)
+    assert circuit.opened_until - now == 60
+
+
+def test_retry_now() -> None:
+    """A returning device is tried before the reset timeout passed."""
+    circuit = CircuitBreaker(1, 60, 600)
+    circuit.record_failure(0)
+
+    circuit.retry_now()
+
+    assert circuit.state is BreakerState.HALF_OPEN
+    assert circuit.allow(1)
@@ -0,0 +1,287 @@
+"""Tests for the polling coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import struct
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bluetti_mqtt.core.utils import modbus_crc
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fake_device import FakeBleakClient
+from custom_components.bluetti_bt import coordinator as coordinator_module
+from custom_components.bluetti_bt.const import (
+    FIELD_DEADBANDS,
+    PACK_SUMMARY_FIELDS,
+    STATIC_FIELDS,
+    WRITE_COALESCE_WINDOW,
+)
+from custom_components.bluetti_bt.coordinator import PollingCoordinator, pack_summary_changed
+from custom_components.bluetti_bt.scheduler import PollingTier
+
+from .conftest import ADDRESS, build_coordinator, patch_fake_client
+
+
+def fail_reads(registers: set[int]) -> Callable[[bytes], bytes | None]:
+    """Build a request hook answering reads of the registers with a MODBUS exception."""
+
+    def hook(data: bytes) -> bytes | None:
+        start, quantity = struct.unpack_from("!HH", data, 2)
+        if data[1] == 3 and registers.intersection(range(start, start + quantity)):
+            response = bytes([1, 0x83, 2])
+            return response + struct.pack("<H", modbus_crc(response))
+        return None
+
+    return hook
+
+
+def reads_of(client: FakeBleakClient, registers: set[int]) -> int:
+    """Count the read requests covering one of the registers."""
+    count = 0
+    for data in client.received:
+        start, quantity = struct.unpack_from("!HH", data, 2)
+        if data[1] == 3 and registers.intersection(range(start, start + quantity)):
+            count += 1
+    return count
+
+
+async def test_failed_static_read_is_retried(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Static fields are read again in the next cycle if their read failed."""
+    static_registers = {
+        f.address
+        for f in coordinator.bluetti_device.struct.fields
+        if f.name in STATIC_FIELDS
+    }
+    fake_client.request_hook = fail_reads(static_registers)
+
+    await coordinator.async_refresh()
+    assert "serial_number" not in coordinator.data
+
+    fake_client.request_hook = None
+    await coordinator.async_refresh()
+    assert coordinator.data["serial_number"] is not None
+
+    # Read once they succeeded
+    reads = reads_of(fake_client, static_registers)
+    await coordinator.async_refresh()
+    assert reads_of(fake_client, static_registers) == reads
+
+
+async def test_pack_demand_polls_summary(hass: HomeAssistant) -> None:
+    """The battery summary is polled while packs are polled."""
+    with patch_fake_client("AC300"):
+        coordinator = build_coordinator(hass, "AC300")
+        pack_key = next(iter(coordinator.pack_register_map))
+        coordinator.async_add_field_demand(pack_key + "1")
+
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+
+    assert coordinator.polling_packs == [1]
+    assert pack_key + "1" in coordinator.data
+    for key in PACK_SUMMARY_FIELDS:
+        if key in coordinator.register_map:
+            assert key in coordinator.data
+
+
+def test_pack_summary_deadband() -> None:
+    """Power jitter below the deadband does not invalidate cached packs."""
+    summary = (80, 100, 0, 50, 0)
+    assert not pack_summary_changed(summary, (80, 102, 0, 49, 0))
+    assert pack_summary_changed(summary, (79, 100, 0, 50, 0))
+    assert pack_summary_changed(summary, (80, 100, 0, 250, 0))
+
+
+async def test_write_waits_for_adapter(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Writes do not connect while another device uses the adapter."""
+    adapter_queue = coordinator.adapter_scheduler.queue(ADDRESS)
+    adapter_queue.limit = 1
+    await adapter_queue.acquire(0)
+
+    write = asyncio.ensure_future(coordinator.async_write_field("ac_output_on", True))
+    await asyncio.sleep(WRITE_COALESCE_WINDOW + 0.1)
+    assert not write.done()
+    assert adapter_queue.depth == 1
+
+    adapter_queue.release()
+    assert await write
+    assert coordinator.field_states.value("ac_output_on") is True
+
+
+async def test_enum_write_is_verified(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Enum fields written by name are verified against the parsed member."""
+    assert await coordinator.async_write_field("charging_mode", "TURBO")
+    assert coordinator.field_states.value("charging_mode").name == "TURBO"
+
+
+async def test_poll_waits_for_advertisement(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Polls connect right after the next advertisement."""
+    with patch.object(
+        coordinator_module.bluetooth, "async_register_callback"
+    ) as register_callback:
+        coordinator.async_track_advertisements()
+    advertisement_callback = register_callback.call_args.args[1]
+
+    poll = asyncio.ensure_future(coordinator.async_refresh())
+    await asyncio.sleep(0.1)
+    assert fake_client.stats.connects == 0
+
+    advertisement_callback(SimpleNamespace(rssi=-60), None)
+    await poll
+    assert coordinator.last_update_success
+    assert fake_client.stats.connects == 1
+    assert coordinator.rssi == -60
+
+
+def write_requests(client: FakeBleakClient) -> list[bytes]:
+    """Get the write requests the device received."""
+    return [request for request in client.received if request[1] in (6, 16)]
+
+
+async def test_flushed_writes_resolve_each_caller(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Writes queued together are sent in one request and verified for every caller."""
+    results = await asyncio.gather(
+        coordinator.async_write_registers({3034: 1}),
+        coordinator.async_write_registers({3035: 0}),
+    )
+
+    assert results == [True, True]
+    assert len(write_requests(fake_client)) == 1
+    assert fake_client.registers[3034] == 1
+    assert fake_client.registers[3035] == 0
+
+
+async def test_repeated_write_to_register(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """The last write to a register wins, the replaced one fails right away."""
+    results = await asyncio.gather(
+        coordinator.async_write_registers({3034: 1}),
+        coordinator.async_write_registers({3034: 2}),
+    )
+
+    assert results == [False, True]
+    assert len(write_requests(fake_client)) == 1
+    assert fake_client.registers[3034] == 2
+
+
+def field_address(coordinator: PollingCoordinator, key: str) -> int:
+    """Get the register of a field."""
+    return next(f.address for f in coordinator.bluetti_device.struct.fields if f.name == key)
+
+
+async def test_unchanged_value_does_not_notify(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Listeners of a field are only called when its value changes."""
+    calls = []
+    coordinator.async_add_key_listener("battery_range_start", lambda: calls.append(1))
+    coordinator.async_add_key_listener("ac_output_on", lambda: calls.append(2))
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert sorted(calls) == [1, 2]
+
+    fake_client.registers[field_address(coordinator, "ac_output_on")] ^= 1
+    await coordinator.async_refresh()
+    assert sorted(calls) == [1, 2, 2]
+
+
+async def test_change_inside_deadband_is_suppressed(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Small changes of noisy fields are not passed on."""
+    key = "ac_output_power"
+    address = field_address(coordinator, key)
+    deadband = FIELD_DEADBANDS[key]
+    fake_client.registers[address] = 100
+    calls = []
+    coordinator.async_add_key_listener(key, lambda: calls.append(coordinator.data[key]))
+
+    await coordinator.async_refresh()
+    fake_client.registers[address] = 100 + deadband - 1
+    await coordinator.async_refresh()
+    assert calls == [100]
+
+    fake_client.registers[address] = 100 + deadband
+    await coordinator.async_refresh()
+    assert calls == [100, 100 + deadband]
+
+
+async def test_availability_change_notifies(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """Listeners are called when their field becomes too old, even without a new value."""
+    key = "ac_output_power"
+    calls = []
+    coordinator.async_add_key_listener(key, lambda: calls.append(coordinator.field_available(key)))
+    await coordinator.async_refresh()
+    assert calls == [True]
+
+    later = time.monotonic() + 3600
+    with patch.object(coordinator_module.time, "monotonic", return_value=later):
+        coordinator.async_update_listeners()
+    assert calls == [True, False]
+
+
+def all_tiers_polled(coordinator: PollingCoordinator) -> bool:
+    """Check that only the tier polled every cycle is due again."""
+    return coordinator.tier_scheduler.due_tiers(time.monotonic()) == {PollingTier.FAST}
+
+
+async def test_lost_response_is_retried_in_cycle(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """A read without response is sent again after the others in the same poll."""
+    requests = 0
+
+    def drop_second_response(data: bytes) -> bytes | None:
+        nonlocal requests
+        requests += 1
+        return b"" if requests == 2 else None
+
+    fake_client.request_hook = drop_second_response
+    await coordinator.async_refresh()
+
+    lost = fake_client.received[1]
+    assert fake_client.received.count(lost) == 2
+    assert fake_client.received[-1] == lost
+    assert fake_client.stats.connects == 1
+    assert all_tiers_polled(coordinator)
+
+
+async def test_poll_resumes_after_reconnect(
+    coordinator: PollingCoordinator, fake_client: FakeBleakClient
+) -> None:
+    """After losing the connection, the poll reconnects and resumes with the failed read."""
+    requests = 0
+
+    def disconnect_on_second_request(data: bytes) -> bytes | None:
+        nonlocal requests
+        requests += 1
+        if requests == 2:
+            fake_client.lose_connection()
+        return None
+
+    fake_client.request_hook = disconnect_on_second_request
+    await coordinator.async_refresh()
+
+    assert fake_client.stats.connects == 2
+    # Reads answered before the connection was lost are not sent again
+    assert len(fake_client.received) == len(set(fake_client.received))
+    assert all_tiers_polled(coordinator)
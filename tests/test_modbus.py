@@ -0,0 +1,87 @@
+"""Tests for MODBUS response handling."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+
+from bluetti_mqtt.bluetooth import ModbusError
+from bluetti_mqtt.core.commands import ReadHoldingRegisters
+from bluetti_mqtt.core.utils import modbus_crc
+
+from custom_components.bluetti_bt.modbus import RequestQueue
+
+
+def build_response(command: ReadHoldingRegisters) -> bytes:
+    """Build a valid response for a read command."""
+    body = bytes(range(2 * command.quantity))
+    response = bytes([1, 3, len(body)]) + body
+    return response + struct.pack("<H", modbus_crc(response))
+
+
+async def test_resend_after_lost_response() -> None:
+    """A command sent again after its response got lost gets the next response."""
+    loop = asyncio.get_running_loop()
+    queue = RequestQueue(late_timeout=2)
+    command = ReadHoldingRegisters(100, 10)
+
+    lost = queue.add(command, loop, 1)
+    queue.expire(lost)
+    resent = queue.add(command, loop, 1)
+
+    response = build_response(command)
+    assert queue.feed(response[:20])
+    assert queue.feed(response[20:])
+    assert resent.future.done()
+    assert bytes(resent.future.result()) == response[3:-2]
+    assert len(queue) == 0
+
+
+async def test_late_response_is_discarded() -> None:
+    """A late response is not taken for the response to a different command."""
+    loop = asyncio.get_running_loop()
+    queue = RequestQueue(late_timeout=2)
+    late_command = ReadHoldingRegisters(100, 10)
+    command = ReadHoldingRegisters(200, 20)
+
+    late = queue.add(late_command, loop, 1)
+    queue.expire(late)
+    request = queue.add(command, loop, 1)
+
+    queue.feed(build_response(late_command))
+    assert not request.future.done()
+    response = build_response(command)
+    queue.feed(response)
+    assert bytes(request.future.result()) == response[3:-2]
+
+
+async def test_exception_header_in_register_data() -> None:
+    """Register data looking like an exception does not fail a request."""
+    loop = asyncio.get_running_loop()
+    queue = RequestQueue(late_timeout=2)
+    broken_command = ReadHoldingRegisters(100, 10)
+    command = ReadHoldingRegisters(200, 20)
+    broken = queue.add(broken_command, loop, 1)
+    request = queue.add(command, loop, 1)
+
+    # First fragment lost, the rest contains 01 83 02 followed by junk
+    body = bytes([0, 1, 0x83, 2, 0x55, 0x55]) + bytes(14)
+    broken_response = bytes([1, 3, 20]) + body
+    broken_response += struct.pack("<H", modbus_crc(broken_response))
+    response = build_response(command)
+    queue.feed(broken_response[4:] + response)
+
+    assert bytes(request.future.result()) == response[3:-2]
+    assert isinstance(broken.future.exception(), TimeoutError)
+
+
+async def test_exception_response() -> None:
+    """A valid exception fails its request with a ModbusError."""
+    loop = asyncio.get_running_loop()
+    queue = RequestQueue(late_timeout=2)
+    request = queue.add(ReadHoldingRegisters(100, 10), loop, 1)
+
+    exception = bytes([1, 0x83, 2])
+    queue.feed(exception + struct.pack("<H", modbus_crc(exception)))
+
+    assert isinstance(request.future.exception(), ModbusError)
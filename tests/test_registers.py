@@ -0,0 +1,106 @@
+"""Tests for register read and write planning."""
+
+from __future__ import annotations
+
+import struct
+
+from bluetti_mqtt.core.commands import (
+    ReadHoldingRegisters,
+    WriteMultipleRegisters,
+    WriteSingleRegister,
+)
+
+from custom_components.bluetti_bt.const import POLLING_MAX_REGISTER_GAP
+from custom_components.bluetti_bt.coordinator import DummyDevice
+from custom_components.bluetti_bt.registers import (
+    MODBUS_MAX_WRITE_REGISTERS,
+    build_register_map,
+    plan_reads,
+    plan_writes,
+    written_registers,
+)
+
+
+def test_gap_inside_device_read_is_bridged() -> None:
+    """Ranges read together by the device commands stay in one read."""
+    ranges = [
+        ReadHoldingRegisters(3001, 16),
+        ReadHoldingRegisters(3036, 1),
+        ReadHoldingRegisters(3061, 1),
+    ]
+    reads = plan_reads(ranges, 125, 16, [ReadHoldingRegisters(3001, 61)])
+
+    assert len(reads) == 1
+    assert reads[0].command.starting_address == 3001
+    assert reads[0].command.quantity == 61
+
+
+def test_gap_between_device_reads_is_split() -> None:
+    """Ranges of separate device commands are not merged across a large gap."""
+    ranges = [ReadHoldingRegisters(10, 4), ReadHoldingRegisters(70, 4)]
+    reads = plan_reads(
+        ranges, 125, 16, [ReadHoldingRegisters(10, 40), ReadHoldingRegisters(70, 21)]
+    )
+
+    assert len(reads) == 2
+
+
+def test_full_demand_plan_needs_no_more_reads(device: DummyDevice) -> None:
+    """Polling all fields never takes more reads than the device commands."""
+    register_map = build_register_map(device, device.polling_commands)
+    ranges = [command for commands in register_map.values() for command in commands]
+
+    reads = plan_reads(
+        ranges,
+        device.max_read_registers,
+        POLLING_MAX_REGISTER_GAP,
+        device.polling_commands,
+    )
+
+    assert len(reads) <= len(device.polling_commands)
+
+
+def test_adjacent_writes_are_merged() -> None:
+    """Contiguous registers are written with one request."""
+    commands = plan_writes({3001: 1, 3002: 2, 3003: 3}, [range(3000, 3062)])
+
+    assert len(commands) == 1
+    assert isinstance(commands[0], WriteMultipleRegisters)
+    assert commands[0].starting_address == 3001
+    assert commands[0].data == struct.pack("!3H", 1, 2, 3)
+    assert list(written_registers(commands[0])) == [3001, 3002, 3003]
+
+
+def test_writes_are_split_at_gaps() -> None:
+    """Registers with a gap between them are written separately."""
+    commands = plan_writes({3001: 1, 3002: 2, 3010: 3}, [range(3000, 3062)])
+
+    assert [list(written_registers(command)) for command in commands] == [
+        [3001, 3002],
+        [3010],
+    ]
+    assert isinstance(commands[1], WriteSingleRegister)
+    assert commands[1].value == 3
+
+
+def test_writes_are_split_at_writable_ranges() -> None:
+    """A write never spans two writable ranges."""
+    commands = plan_writes(
+        {3004: 1, 3005: 2, 3006: 3}, [range(3000, 3005), range(3005, 3010)]
+    )
+
+    assert [list(written_registers(command)) for command in commands] == [
+        [3004],
+        [3005, 3006],
+    ]
+
+
+def test_long_writes_are_split() -> None:
+    """Writes are split at the maximum registers of one request."""
+    registers = {3000 + offset: offset for offset in range(MODBUS_MAX_WRITE_REGISTERS + 1)}
+    commands = plan_writes(registers, [range(3000, 4000)])
+
+    assert [len(written_registers(command)) for command in commands] == [
+        MODBUS_MAX_WRITE_REGISTERS,
+        1,
+    ]
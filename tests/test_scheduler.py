@@ -0,0 +1,45 @@
+"""Tests for polling tiers and the cycle budget."""
+
+from __future__ import annotations
+
+from bluetti_mqtt.core.commands import ReadHoldingRegisters
+
+from custom_components.bluetti_bt.scheduler import CommandPriority, CycleBudget
+
+
+def test_low_priority_keeps_reserve() -> None:
+    """Low priority commands are dropped once only the reserve is left."""
+    budget = CycleBudget(100, 10, 0.2)
+
+    assert budget.allows(CommandPriority.LOW, 1, 100)
+    assert budget.allows(CommandPriority.LOW, 1, 107)
+    assert not budget.allows(CommandPriority.LOW, 1, 107.5)
+    assert not budget.allows(CommandPriority.LOW, 9, 100)
+
+
+def test_high_priority_uses_reserve() -> None:
+    """High priority commands are sent while any time is left."""
+    budget = CycleBudget(100, 10, 0.2)
+
+    assert budget.allows(CommandPriority.HIGH, 20, 100)
+    assert budget.allows(CommandPriority.HIGH, 1, 109.9)
+
+
+def test_nothing_is_sent_without_time_left() -> None:
+    """No command is sent once the budget is used up."""
+    budget = CycleBudget(100, 10, 0.2)
+
+    assert budget.remaining(110) == 0
+    assert budget.remaining(120) == 0
+    assert not budget.allows(CommandPriority.HIGH, 1, 110)
+    assert not budget.allows(CommandPriority.LOW, 0, 110)
+
+
+def test_dropped_commands_are_recorded() -> None:
+    """Dropped commands are kept for the cycle statistics."""
+    budget = CycleBudget(100, 10, 0.2)
+    commands = [ReadHoldingRegisters(10, 5), ReadHoldingRegisters(100, 20)]
+
+    budget.drop(*commands)
+
+    assert budget.dropped == commands
@@ -0,0 +1,144 @@
+"""Tests for the stored device state."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from enum import Enum
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.bluetti_bt import coordinator as coordinator_module
+from custom_components.bluetti_bt.const import (
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.snapshot import SnapshotStore
+
+from .conftest import ADDRESS, build_coordinator, patch_fake_client
+
+
+def store_snapshot(
+    hass_storage: dict[str, Any], data: dict[str, Any], version: int = SNAPSHOT_STORAGE_VERSION
+) -> None:
+    """Put a snapshot into the mocked storage."""
+    key = f"{DOMAIN}.{ADDRESS}"
+    hass_storage[key] = {"version": version, "minor_version": 1, "key": key, "data": data}
+
+
+def field_available_at(coordinator: PollingCoordinator, key: str, now: float) -> bool:
+    """Check the availability of a field at a later time."""
+    with patch.object(coordinator_module.time, "monotonic", return_value=now):
+        return coordinator.field_available(key)
+
+
+async def test_restored_fields_expire_without_poll(
+    hass: HomeAssistant, hass_storage: dict[str, Any], coordinator: PollingCoordinator
+) -> None:
+    """Restored fields expire like polled ones if no poll finishes in time."""
+    store_snapshot(hass_storage, {"data": {"ac_output_power": 120}})
+    assert await coordinator.async_restore_snapshot()
+    later = time.monotonic() + 3600
+    assert field_available_at(coordinator, "ac_output_power", later)
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=coordinator.polling_timeout + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert not coordinator.stale
+    assert coordinator.field_available("ac_output_power")
+    assert not field_available_at(coordinator, "ac_output_power", later)
+
+
+@pytest.mark.parametrize("model", ["EB3A", "AC300"])
+async def test_polled_data_round_trip(
+    hass: HomeAssistant, hass_storage: dict[str, Any], model: str
+) -> None:
+    """Polled values of every field type are restored unchanged."""
+    with patch_fake_client(model):
+        coordinator = build_coordinator(hass, model)
+        assert not await coordinator.async_restore_snapshot()
+        await coordinator.async_refresh()
+    polled = {
+        key: value for key, value in coordinator.field_states.values().items() if value is not None
+    }
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    restored = await SnapshotStore(hass, ADDRESS, coordinator.bluetti_device).async_load()
+
+    assert restored == polled
+    types = {type(value) for value in restored.values()}
+    assert {str, int, bool, Decimal} <= types
+    assert any(issubclass(value_type, Enum) for value_type in types)
+
+
+async def test_restore_snapshot(
+    hass: HomeAssistant, hass_storage: dict[str, Any], coordinator: PollingCoordinator
+) -> None:
+    """Stored values are decoded and shown until the first poll."""
+    store_snapshot(
+        hass_storage,
+        {
+            "data": {
+                "serial_number": 1234,
+                "device_type": "EB3A",
+                "arm_version": {"decimal": "1.04"},
+                "charging_mode": {"enum": "TURBO"},
+                "ac_output_on": True,
+            }
+        },
+    )
+
+    assert await coordinator.async_restore_snapshot()
+
+    assert coordinator.stale
+    assert coordinator.data["serial_number"] == 1234
+    assert coordinator.data["device_type"] == "EB3A"
+    assert coordinator.data["arm_version"] == Decimal("1.04")
+    assert coordinator.data["charging_mode"].name == "TURBO"
+    assert coordinator.data["ac_output_on"] is True
+
+
+async def test_changed_fields_are_skipped(
+    hass: HomeAssistant, hass_storage: dict[str, Any], coordinator: PollingCoordinator
+) -> None:
+    """Values which do not fit the current fields anymore are dropped."""
+    store_snapshot(
+        hass_storage,
+        {"data": {"charging_mode": {"enum": "UNKNOWN"}, "ac_output_power": 120}},
+    )
+
+    assert await coordinator.async_restore_snapshot()
+
+    assert coordinator.data == {"ac_output_power": 120}
+
+
+@pytest.mark.parametrize(
+    "version", [SNAPSHOT_STORAGE_VERSION - 1, SNAPSHOT_STORAGE_VERSION + 1]
+)
+async def test_other_version_is_ignored(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    coordinator: PollingCoordinator,
+    version: int,
+) -> None:
+    """Snapshots of another storage version are not restored."""
+    store_snapshot(hass_storage, {"data": {"ac_output_power": 120}}, version)
+
+    assert not await coordinator.async_restore_snapshot()
+
+    assert coordinator.data is None
+    assert not coordinator.stale